@@ -1,9 +1,13 @@
 import streamlit as st
-import tempfile
 import os
-from pdf_processor import extract_text_from_pdf
-from openai_service import summarize_text, synthesize_summaries
+from pdf_preflight import triage_pdfs, STATUS_OK, STATUS_ENCRYPTED, STATUS_NO_TEXT, STATUS_CORRUPT, STATUS_OVERSIZED
+from openai_service import RunReport
+from pipeline import (extract_document, summarize_document, synthesize_documents, run_pipeline_step,
+                      MAX_UPLOAD_BYTES)
+from document_store import get_store
+from ingestion import IngestionSession
 from pdf_generator import create_summary_pdf
+from cancellation import CancellationToken, CancelledError
 import io
 
 # Configure page layout and styling
@@ -200,7 +204,7 @@ def main():
         """, unsafe_allow_html=True)
     
     # Show upload section if Get Started was clicked or files are present
-    if st.session_state.get("show_upload", False) or "uploaded_files" in st.session_state:
+    if st.session_state.get("show_upload", False) or "uploads" in st.session_state:
         st.markdown("---")
         
         # File upload section with modern styling
@@ -217,25 +221,37 @@ def main():
         )
         st.markdown('</div>', unsafe_allow_html=True)
         
-        if uploaded_files:
-            st.session_state.uploaded_files = uploaded_files
+        # Spool uploads to disk once, within the per-file and per-session byte budgets
+        if "ingestion" not in st.session_state:
+            st.session_state.ingestion = IngestionSession()
+        ingestion = st.session_state.ingestion
+        uploads, rejected = ingestion.sync(uploaded_files or [])
+        for filename, reason in rejected:
+            st.error(f"❌ {reason}")
+        
+        if uploads:
+            st.session_state.uploads = uploads
             
             # Display uploaded files with modern styling
-            st.markdown(f'<div class="success-message">✅ {len(uploaded_files)} file(s) uploaded successfully</div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="success-message">✅ {len(uploads)} file(s) uploaded successfully</div>', unsafe_allow_html=True)
             
             # File list
             st.markdown("**Uploaded Documents:**")
-            for i, file in enumerate(uploaded_files, 1):
+            for i, file in enumerate(uploads, 1):
                 st.markdown(f'<div class="file-item">{i}. <strong>{file.name}</strong> ({file.size:,} bytes)</div>', 
                            unsafe_allow_html=True)
             
+            usage = ingestion.memory_usage()
+            st.caption(f"Session uploads: {usage['spooled_mb']:.1f} MB of {usage['budget_mb']:.0f} MB · "
+                       f"Server memory: {usage['rss_mb']:.0f} MB")
+            
             # Action section with gradient background
             st.markdown('<div class="action-section">', unsafe_allow_html=True)
             st.markdown("### 🚀 Generate AI Analysis")
             st.markdown("Transform your documents into structured insights with comprehensive synthesis")
             
             if st.button("Generate Summary", type="primary", use_container_width=True):
-                process_files(uploaded_files)
+                process_files(uploads)
             st.markdown('</div>', unsafe_allow_html=True)
         
         elif st.session_state.get("show_upload", False):
@@ -277,42 +293,82 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
 
-def process_files(uploaded_files):
-    """Process uploaded PDF files and generate summary"""
+def run_cancellable(progress_bar, progress, cancel_token, fn, *args, **kwargs):
+    """
+    Run a blocking pipeline step in a worker thread
+    
+    The script thread keeps updating the progress bar while it waits. Each
+    update is a point where Streamlit stops a run that was superseded by a
+    rerun or whose session ended, which lets process_files cancel the token.
+    """
+    return run_pipeline_step(lambda: progress_bar.progress(progress), cancel_token, fn, *args, **kwargs)
+
+def process_files(uploads):
+    """Process spooled PDF uploads and generate summary"""
     
     # Initialize progress tracking
     progress_bar = st.progress(0)
     status_text = st.empty()
     
+    # Cancel any run still in flight for this session before starting a new one
+    previous_token = st.session_state.get("cancel_token")
+    if previous_token is not None:
+        previous_token.cancel()
+    cancel_token = CancellationToken()
+    st.session_state.cancel_token = cancel_token
+    
+    # Extracted text, summaries and syntheses are stored by file content hash and
+    # reused across cancelled runs, sessions and app instances on this host
+    store = get_store()
+    
+    # Routing decisions, latency and cost of this run's OpenAI calls
+    report = RunReport()
+    
     try:
+        # Pre-flight: reject encrypted, image-only, corrupt and oversized files before parsing
+        status_text.text("🔎 Checking uploaded files...")
+        triage = triage_pdfs([(str(i), upload.path) for i, upload in enumerate(uploads)],
+                             max_bytes=MAX_UPLOAD_BYTES)
+        
+        for result in triage[STATUS_ENCRYPTED]:
+            st.warning(f"🔒 {uploads[int(result['name'])].name} is encrypted and cannot be processed")
+        for result in triage[STATUS_NO_TEXT]:
+            st.warning(f"⚠️ No text layer found in {uploads[int(result['name'])].name} (image-only PDF)")
+        for result in triage[STATUS_CORRUPT]:
+            st.error(f"❌ {uploads[int(result['name'])].name} is not a valid PDF: {result['reason']}")
+        for result in triage[STATUS_OVERSIZED]:
+            st.error(f"❌ {uploads[int(result['name'])].name} exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit")
+        
+        accepted = sorted(int(result['name']) for result in triage[STATUS_OK])
+        uploads = [uploads[i] for i in accepted]
+        
+        if not uploads:
+            st.error("❌ None of the uploaded files can be processed")
+            return
+        
         # Step 1: Extract text from all PDFs
         status_text.text("📖 Extracting text from PDF files...")
         extracted_texts = []
         file_names = []
         
-        for i, uploaded_file in enumerate(uploaded_files):
+        for i, upload in enumerate(uploads):
             # Update progress
-            progress = (i + 1) / (len(uploaded_files) * 4)  # 4 total steps
+            progress = (i + 1) / (len(uploads) * 4)  # 4 total steps
             progress_bar.progress(progress)
             
-            # Save uploaded file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_file_path = tmp_file.name
-            
             try:
-                # Extract text from PDF
-                text = extract_text_from_pdf(tmp_file_path)
+                # Extract text from the spooled PDF
+                text = run_cancellable(progress_bar, progress, cancel_token, extract_document, upload.path,
+                                       file_hash=upload.sha256, filename=upload.name, store=store)
                 if text.strip():
                     extracted_texts.append(text)
-                    file_names.append(uploaded_file.name)
+                    file_names.append(upload.name)
                 else:
-                    st.warning(f"⚠️ No readable text found in {uploaded_file.name}")
+                    st.warning(f"⚠️ No readable text found in {upload.name}")
+            except CancelledError:
+                raise
             except Exception as e:
-                st.error(f"❌ Error processing {uploaded_file.name}: {str(e)}")
-            finally:
-                # Clean up temporary file
-                os.unlink(tmp_file_path)
+                st.error(f"❌ Error processing {upload.name}: {str(e)}")
         
         if not extracted_texts:
             st.error("❌ No readable text found in any of the uploaded PDFs")
@@ -324,16 +380,15 @@ def process_files(uploaded_files):
         
         for i, (text, filename) in enumerate(zip(extracted_texts, file_names)):
             # Update progress
-            progress = (len(uploaded_files) + i + 1) / (len(uploaded_files) * 4)
+            progress = (len(uploads) + i + 1) / (len(uploads) * 4)
             progress_bar.progress(progress)
             
             try:
-                summary = summarize_text(text, filename)
-                summaries.append({
-                    'filename': filename,
-                    'summary': summary,
-                    'word_count': len(text.split())
-                })
+                summary_data = run_cancellable(progress_bar, progress, cancel_token, summarize_document,
+                                               text, filename, report=report, store=store)
+                summaries.append(summary_data)
+            except CancelledError:
+                raise
             except Exception as e:
                 st.error(f"❌ Error summarizing {filename}: {str(e)}")
                 return
@@ -343,7 +398,10 @@ def process_files(uploaded_files):
         progress_bar.progress(0.75)
         
         try:
-            synthesis = synthesize_summaries(summaries)
+            synthesis = run_cancellable(progress_bar, 0.75, cancel_token, synthesize_documents, summaries,
+                                        report=report, store=store)
+        except CancelledError:
+            raise
         except Exception as e:
             st.error(f"❌ Error creating synthesis: {str(e)}")
             return
@@ -353,7 +411,9 @@ def process_files(uploaded_files):
         progress_bar.progress(0.9)
         
         try:
-            pdf_buffer = create_summary_pdf(summaries, synthesis)
+            pdf_buffer = run_cancellable(progress_bar, 0.9, cancel_token, create_summary_pdf, summaries, synthesis)
+        except CancelledError:
+            raise
         except Exception as e:
             st.error(f"❌ Error generating PDF: {str(e)}")
             return
@@ -377,6 +437,27 @@ def process_files(uploaded_files):
                 st.markdown(summary_data['summary'])
                 st.divider()
         
+        # Show model routing, latency and cost
+        with st.expander("⚙️ Run Report"):
+            totals = report.totals()
+            if totals['calls']:
+                st.write(f"**API calls:** {totals['calls']} "
+                         f"({', '.join(f'{model}: {count}' for model, count in totals['models'].items())})")
+                st.write(f"**Tokens:** {totals['input_tokens']:,} in / {totals['output_tokens']:,} out")
+                st.write(f"**Total API latency:** {totals['latency']:.1f}s")
+                st.write(f"**Estimated cost:** ${totals['cost']:.4f}")
+                st.table([{
+                    'Call': call['label'],
+                    'Model': call['model'],
+                    'Max tokens': call['max_tokens'],
+                    'Tokens in': call['input_tokens'],
+                    'Tokens out': call['output_tokens'],
+                    'Latency (s)': round(call['latency'], 2),
+                    'Cost ($)': round(call['cost'], 5)
+                } for call in report.calls])
+            else:
+                st.write("All results were reused from earlier runs.")
+        
         # Download button
         st.download_button(
             label="📥 Download Summary PDF",
@@ -386,9 +467,14 @@ def process_files(uploaded_files):
             type="primary"
         )
         
+    except CancelledError:
+        st.info("⏹️ Processing was cancelled")
     except Exception as e:
         st.error(f"❌ An unexpected error occurred: {str(e)}")
     finally:
+        # Stop any work still running, e.g. when Streamlit stops this run for a rerun
+        cancel_token.cancel()
+        
         # Clean up progress indicators
         progress_bar.empty()
         status_text.empty()
@@ -0,0 +1,99 @@
+"""
+Batch summarization of a directory of PDFs through the shared document store
+
+Documents, summaries and the synthesis already in the store (from the app or
+earlier batch runs) are reused; only new or changed files and outdated
+prompt versions cost extraction and API calls.
+
+Usage:
+    python batch_runner.py reports/ --workers 4 --synthesis --output summary.pdf
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from document_store import DocumentStore, DOCUMENT_STORE_PATH, file_sha256
+from pdf_preflight import preflight_pdf, STATUS_OK
+from openai_service import RunReport
+from pipeline import extract_document, summarize_document, synthesize_documents, MAX_UPLOAD_BYTES
+
+def process_document(path: str, store: DocumentStore, report: RunReport) -> Optional[Dict]:
+    """
+    Extract and summarize one PDF, reusing stored results
+
+    Args:
+        path (str): Path to the PDF file
+        store (DocumentStore): Shared document store
+        report (RunReport): Collects the API calls made
+
+    Returns:
+        Optional[Dict]: Summary dictionary with 'filename', 'summary' and 'word_count'
+            keys, or None if the file cannot be processed
+    """
+    filename = os.path.basename(path)
+    result = preflight_pdf(path, max_bytes=MAX_UPLOAD_BYTES)
+    if result['status'] != STATUS_OK:
+        print(f"  skipped {filename}: {result['status']} ({result['reason']})", file=sys.stderr)
+        return None
+
+    file_hash = file_sha256(path)
+    text = extract_document(path, file_hash=file_hash, filename=filename, store=store)
+    if not text.strip():
+        print(f"  skipped {filename}: no readable text", file=sys.stderr)
+        return None
+
+    return summarize_document(text, filename, report=report, store=store)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="Directory containing PDF files")
+    parser.add_argument("--workers", type=int, default=4, help="Documents processed in parallel")
+    parser.add_argument("--synthesis", action="store_true", help="Also synthesize the document summaries")
+    parser.add_argument("--output", help="Write the summaries (and synthesis) to this PDF file")
+    parser.add_argument("--store", default=DOCUMENT_STORE_PATH, help="Path of the SQLite document store")
+    args = parser.parse_args()
+
+    paths = sorted(os.path.join(args.directory, name) for name in os.listdir(args.directory)
+                   if name.lower().endswith(".pdf"))
+    if not paths:
+        parser.error(f"No PDF files found in {args.directory}")
+
+    store = DocumentStore(args.store)
+    report = RunReport()
+    started = time.perf_counter()
+
+    summaries: List[Dict] = []
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [(path, pool.submit(process_document, path, store, report)) for path in paths]
+        for path, future in futures:
+            try:
+                summary_data = future.result()
+            except Exception as e:
+                print(f"  failed {os.path.basename(path)}: {str(e)}", file=sys.stderr)
+                continue
+            if summary_data is not None:
+                summaries.append(summary_data)
+                print(f"  {summary_data['filename']}: {summary_data['word_count']:,} words")
+
+    synthesis = ""
+    if args.synthesis and summaries:
+        synthesis = synthesize_documents(summaries, report=report, store=store)
+
+    if args.output and summaries:
+        from pdf_generator import create_summary_pdf
+        with open(args.output, 'wb') as output:
+            output.write(create_summary_pdf(summaries, synthesis).getvalue())
+
+    stats = store.stats()
+    totals = report.totals()
+    print(f"\nProcessed {len(summaries)} of {len(paths)} documents in {time.perf_counter() - started:.1f}s")
+    print(f"Store lookups: {stats['hits']} reused, {stats['misses']} computed "
+          f"({stats['documents']} documents, {stats['summaries']} summaries, "
+          f"{stats['syntheses']} syntheses stored in {args.store})")
+    print(f"API calls: {totals['calls']}, estimated cost ${totals['cost']:.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Throughput benchmarks for the document processing pipeline
+
+Usage:
+    python benchmarks.py compression --pages 1000
+    python benchmarks.py backends report.pdf other.pdf
+    python benchmarks.py cleaning --pages 1000
+"""
+import argparse
+import random
+import re
+import time
+from collections import Counter
+
+from text_compressor import compress_text, estimate_tokens
+from extraction_backends import DEFAULT_BACKEND, available_backends
+from pdf_processor import extract_text_from_pdf, clean_extracted_text, remove_repeated_lines
+
+WORDS = (
+    "analysis market revenue growth model policy research data risk climate energy "
+    "customer strategy product network security system performance quality cost "
+    "investment regulation supply demand forecast survey result method evidence "
+    "trend impact region sector framework outcome review process design finding"
+).split()
+
+def generate_document(pages: int, chars_per_page: int = 3000, seed: int = 0) -> str:
+    """
+    Generate synthetic, cleaned document text
+
+    Args:
+        pages (int): Number of pages to generate
+        chars_per_page (int): Approximate characters per page
+        seed (int): Random seed for reproducible output
+
+    Returns:
+        str: Synthetic document text
+    """
+    rng = random.Random(seed)
+    sentences = []
+    total_chars = pages * chars_per_page
+    length = 0
+    while length < total_chars:
+        words = rng.choices(WORDS, k=rng.randint(8, 25))
+        sentence = ' '.join(words).capitalize() + '.'
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    return ' '.join(sentences)
+
+def bench_compression(pages: int, token_budget: int, repeat: int) -> None:
+    """Benchmark extractive pre-compression on a synthetic document"""
+    text = generate_document(pages)
+    size_mb = len(text.encode('utf-8')) / 1e6
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compressed = compress_text(text, token_budget)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(f"Input: {pages:,} pages, {size_mb:.1f} MB, ~{estimate_tokens(text):,} tokens")
+    print(f"Output: ~{estimate_tokens(compressed):,} tokens "
+          f"({estimate_tokens(text) / max(estimate_tokens(compressed), 1):.0f}x reduction)")
+    print(f"Best of {repeat}: {best:.3f}s ({pages / best:,.0f} pages/s, {size_mb / best:.1f} MB/s)")
+
+def generate_raw_pages(pages: int, seed: int = 0):
+    """Generate raw page texts with short lines, hyphenation and running headers"""
+    rng = random.Random(seed)
+    page_texts = []
+    for page_num in range(1, pages + 1):
+        lines = ["Quarterly Market Review", ""]
+        for _ in range(45):
+            words = rng.choices(WORDS, k=rng.randint(6, 12))
+            line = "  ".join(words)
+            if rng.random() < 0.1:
+                line += " invest-"
+            lines.append(line + "   ")
+        lines += ["", f"Page {page_num} of {pages}"]
+        page_texts.append("\n".join(lines))
+    return page_texts
+
+def legacy_clean_extracted_text(text: str) -> str:
+    """The previous line-by-line cleaning implementation, kept as a baseline"""
+    if not text:
+        return ""
+    lines = text.split('\n')
+    cleaned_lines = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            cleaned_lines.append(line)
+    cleaned_text = ' '.join(cleaned_lines)
+    cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
+    return cleaned_text.strip()
+
+def bench_cleaning(pages: int, repeat: int) -> None:
+    """Microbenchmark text cleaning throughput in MB/s"""
+    page_texts = generate_raw_pages(pages)
+    text = "\n".join(page_texts)
+    size_mb = len(text.encode('utf-8')) / 1e6
+    print(f"Input: {pages:,} pages, {size_mb:.1f} MB")
+
+    cases = [
+        ("legacy", lambda: legacy_clean_extracted_text(text)),
+        ("single-pass", lambda: clean_extracted_text(text)),
+        ("+ dehyphenate", lambda: clean_extracted_text(text, dehyphenate=True)),
+        ("+ headers/footers", lambda: clean_extracted_text("\n".join(remove_repeated_lines(page_texts)),
+                                                          dehyphenate=True)),
+    ]
+    for label, case in cases:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cleaned = case()
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"  {label:<18} {size_mb / best:8.1f} MB/s  ~{estimate_tokens(cleaned):,} tokens")
+
+def word_overlap(reference: str, candidate: str) -> float:
+    """Multiset word overlap between two texts, 1.0 for identical output"""
+    reference_words = Counter(reference.split())
+    candidate_words = Counter(candidate.split())
+    union = sum((reference_words | candidate_words).values())
+    return sum((reference_words & candidate_words).values()) / union if union else 1.0
+
+def bench_backends(paths, repeat: int) -> None:
+    """Benchmark full-document extraction speed and output parity per backend"""
+    backends = available_backends()
+    print(f"Installed backends: {', '.join(backends)}")
+
+    for path in paths:
+        print(f"\n{path}")
+        reference = extract_text_from_pdf(path, backend=DEFAULT_BACKEND)
+        for backend in backends:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                text = extract_text_from_pdf(path, backend=backend)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            print(f"  {backend:<10} {best:8.3f}s  {len(text):>10,} chars  "
+                  f"parity {word_overlap(reference, text):.3f}")
+
+        start = time.perf_counter()
+        extract_text_from_pdf(path, backend="auto")
+        print(f"  {'auto':<10} {time.perf_counter() - start:8.3f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    compression = subparsers.add_parser("compression", help="Extractive pre-compression throughput")
+    compression.add_argument("--pages", type=int, default=1000)
+    compression.add_argument("--token-budget", type=int, default=2800)
+    compression.add_argument("--repeat", type=int, default=3)
+
+    backends = subparsers.add_parser("backends", help="Extraction backend speed and output parity")
+    backends.add_argument("paths", nargs="+", help="PDF files to extract")
+    backends.add_argument("--repeat", type=int, default=3)
+
+    cleaning = subparsers.add_parser("cleaning", help="Text cleaning throughput")
+    cleaning.add_argument("--pages", type=int, default=1000)
+    cleaning.add_argument("--repeat", type=int, default=5)
+
+    args = parser.parse_args()
+    if args.benchmark == "compression":
+        bench_compression(args.pages, args.token_budget, args.repeat)
+    elif args.benchmark == "backends":
+        bench_backends(args.paths, args.repeat)
+    elif args.benchmark == "cleaning":
+        bench_cleaning(args.pages, args.repeat)
+
+if __name__ == "__main__":
+    main()
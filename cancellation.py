@@ -0,0 +1,73 @@
+import threading
+from typing import Callable, List
+
+class CancelledError(Exception):
+    """Raised when work is abandoned because its cancellation token was cancelled"""
+
+class CancellationToken:
+    """
+    Cooperative cancellation signal shared by one run of the pipeline
+
+    Long-running work checks the token between units of work (pages, API
+    calls, PDF pages) and stops by raising CancelledError. Callbacks let
+    blocking operations such as in-flight HTTP requests be aborted as soon as
+    the token is cancelled.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Cancel the token and run all registered callbacks once"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raises:
+            CancelledError: If the token has been cancelled
+        """
+        if self._event.is_set():
+            raise CancelledError("Operation was cancelled")
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """
+        Register a callback to run on cancellation
+
+        The callback runs immediately if the token is already cancelled.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+def check_cancelled(cancel_token: "CancellationToken" = None) -> None:
+    """
+    Raise CancelledError if an optional token has been cancelled
+
+    Args:
+        cancel_token (CancellationToken): Token to check, or None
+    """
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
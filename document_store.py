@@ -0,0 +1,270 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Shared on-disk store of extracted text, summaries and syntheses. Every app
+# instance and batch run on the host that points at the same file reuses work
+# done by the others.
+DOCUMENT_STORE_PATH = os.getenv(
+    "DOCUMENT_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "document_store.sqlite3")
+)
+
+# How long a writer waits for another process's write lock before failing
+BUSY_TIMEOUT_MS = 10000
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# Stores written with another schema version are rebuilt; everything in them
+# can be recomputed
+SCHEMA_VERSION = 2
+
+SCHEMA = [
+    """CREATE TABLE documents (
+        sha256 TEXT NOT NULL,
+        extraction_version TEXT NOT NULL,
+        backend TEXT NOT NULL,
+        filename TEXT NOT NULL,
+        text TEXT NOT NULL,
+        word_count INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        PRIMARY KEY (sha256, extraction_version, backend)
+    )""",
+    """CREATE TABLE summaries (
+        text_sha256 TEXT NOT NULL,
+        prompt_version TEXT NOT NULL,
+        model TEXT NOT NULL,
+        summary TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        PRIMARY KEY (text_sha256, prompt_version)
+    )""",
+    """CREATE TABLE syntheses (
+        synthesis_key TEXT NOT NULL,
+        prompt_version TEXT NOT NULL,
+        model TEXT NOT NULL,
+        synthesis TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        PRIMARY KEY (synthesis_key, prompt_version)
+    )""",
+]
+
+TABLES = ("documents", "summaries", "syntheses")
+
+def file_sha256(path: str) -> str:
+    """
+    SHA-256 of a file's content, read in chunks
+
+    Args:
+        path (str): Path to the file
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def text_sha256(text: str) -> str:
+    """
+    Reuse key for a summary: the SHA-256 of the exact text it summarizes
+
+    Text extracted with other settings or by another backend gets a
+    different key, so summaries are never shared between different inputs.
+
+    Args:
+        text (str): Extracted document text
+
+    Returns:
+        str: Hex digest
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def synthesis_key(summaries: List[Dict]) -> str:
+    """
+    Reuse key for a synthesis: the filenames and summaries in prompt order
+
+    Args:
+        summaries (List[Dict]): Dictionaries with 'filename' and 'summary' keys
+
+    Returns:
+        str: Hex digest identifying the synthesis input
+    """
+    payload = json.dumps([[summary['filename'], summary['summary']] for summary in summaries], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class DocumentStore:
+    """
+    SQLite-backed reuse index keyed by content hash
+
+    Holds extracted text per PDF hash, extraction settings version and
+    backend, summaries per text hash and prompt version, and syntheses per
+    summary set and prompt version. The model each result was made with is
+    recorded alongside it. Entries made with other settings or prompts are
+    simply not found, so changing either makes the old entries stale without
+    a migration.
+
+    The database runs in WAL mode so several app instances and batch runs on
+    the same host can read while one of them writes. Each thread uses its own
+    connection.
+    """
+
+    def __init__(self, path: str = DOCUMENT_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        self._create_schema(connection)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            connection.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _create_schema(connection: sqlite3.Connection) -> None:
+        """Create the tables, rebuilding them if the store has another schema version"""
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                for table in TABLES:
+                    connection.execute(f"DROP TABLE IF EXISTS {table}")
+                for statement in SCHEMA:
+                    connection.execute(statement)
+                connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _fetch(self, query: str, params: tuple) -> Optional[tuple]:
+        row = self._connection().execute(query, params).fetchone()
+        with self._lock:
+            self._stats['hits' if row is not None else 'misses'] += 1
+        return row
+
+    def _write(self, query: str, params: tuple) -> None:
+        self._connection().execute(query, params + (time.time(),))
+
+    def get_document(self, sha256: str, extraction_version: str, backend: Optional[str] = None) -> Optional[Dict]:
+        """
+        Look up extracted text for a document
+
+        Args:
+            sha256 (str): Content hash of the PDF
+            extraction_version (str): Version of the extraction settings
+            backend (Optional[str]): Extraction backend that produced the text; None
+                accepts any backend and returns the text stored first, so repeated
+                lookups see the same text
+
+        Returns:
+            Optional[Dict]: Dictionary with 'text', 'word_count' and 'backend' keys, or None
+        """
+        if backend is None:
+            row = self._fetch("SELECT text, word_count, backend FROM documents "
+                              "WHERE sha256 = ? AND extraction_version = ? ORDER BY created_at LIMIT 1",
+                              (sha256, extraction_version))
+        else:
+            row = self._fetch("SELECT text, word_count, backend FROM documents "
+                              "WHERE sha256 = ? AND extraction_version = ? AND backend = ?",
+                              (sha256, extraction_version, backend))
+        if row is None:
+            return None
+        return {'text': row[0], 'word_count': row[1], 'backend': row[2]}
+
+    def put_document(self, sha256: str, extraction_version: str, backend: str, filename: str, text: str) -> None:
+        """Store extracted text for a document"""
+        self._write("INSERT OR REPLACE INTO documents "
+                    "(sha256, extraction_version, backend, filename, text, word_count, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (sha256, extraction_version, backend, filename, text, len(text.split())))
+
+    def get_summary(self, text_key: str, prompt_version: str) -> Optional[str]:
+        """
+        Look up a document summary
+
+        Args:
+            text_key (str): Hash of the summarized text from text_sha256
+            prompt_version (str): Version of the summary prompt and routing settings
+
+        Returns:
+            Optional[str]: The summary, or None
+        """
+        row = self._fetch("SELECT summary FROM summaries WHERE text_sha256 = ? AND prompt_version = ?",
+                          (text_key, prompt_version))
+        return row[0] if row is not None else None
+
+    def put_summary(self, text_key: str, prompt_version: str, model: str, summary: str) -> None:
+        """Store a document summary and the model it was made with"""
+        self._write("INSERT OR REPLACE INTO summaries (text_sha256, prompt_version, model, summary, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (text_key, prompt_version, model, summary))
+
+    def get_synthesis(self, key: str, prompt_version: str) -> Optional[str]:
+        """
+        Look up a synthesis
+
+        Args:
+            key (str): Summary set key from synthesis_key
+            prompt_version (str): Version of the synthesis prompt and routing settings
+
+        Returns:
+            Optional[str]: The synthesis, or None
+        """
+        row = self._fetch("SELECT synthesis FROM syntheses WHERE synthesis_key = ? AND prompt_version = ?",
+                          (key, prompt_version))
+        return row[0] if row is not None else None
+
+    def put_synthesis(self, key: str, prompt_version: str, model: str, synthesis: str) -> None:
+        """Store a synthesis and the model it was made with"""
+        self._write("INSERT OR REPLACE INTO syntheses (synthesis_key, prompt_version, model, synthesis, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, prompt_version, model, synthesis))
+
+    def stats(self) -> Dict:
+        """
+        Returns:
+            Dict: Lookup hits and misses since this store was opened, and row counts
+        """
+        connection = self._connection()
+        with self._lock:
+            stats = dict(self._stats)
+        for table in TABLES:
+            stats[table] = connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        return stats
+
+    def close(self) -> None:
+        """Close this thread's connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+_store: Optional[DocumentStore] = None
+_store_lock = threading.Lock()
+
+def get_store() -> DocumentStore:
+    """
+    Returns:
+        DocumentStore: The process-wide store at DOCUMENT_STORE_PATH
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DocumentStore()
+        return _store
@@ -0,0 +1,360 @@
+import io
+import mmap
+import os
+import time
+from typing import BinaryIO, Dict, List, Type, Union
+
+# Registry of PDF text extraction backends. pypdf (or the older PyPDF2) is
+# always available; faster native backends are used when installed.
+
+# Backend used by extract_text_from_pdf: a registered backend name or "auto"
+EXTRACTION_BACKEND = os.getenv("PDF_EXTRACTION_BACKEND", "auto")
+
+DEFAULT_BACKEND = "pypdf"
+
+# Documents smaller than this always use the default backend in auto mode
+AUTO_PROBE_MIN_BYTES = 256 * 1024
+
+# Pages extracted by each backend when probing in auto mode, spread evenly
+# from the first page to the last
+AUTO_PROBE_PAGES = 3
+
+PdfSource = Union[str, bytes, BinaryIO]
+
+BACKENDS: Dict[str, Type["ExtractionBackend"]] = {}
+
+def register_backend(backend_cls: Type["ExtractionBackend"]) -> Type["ExtractionBackend"]:
+    """
+    Register an extraction backend under its name
+
+    Args:
+        backend_cls (Type[ExtractionBackend]): Backend class to register
+
+    Returns:
+        Type[ExtractionBackend]: The same class, so this can be used as a decorator
+    """
+    BACKENDS[backend_cls.name] = backend_cls
+    return backend_cls
+
+class ExtractionBackend:
+    """
+    An open PDF document read through a specific extraction library
+
+    Subclasses set `name`, implement `is_available`, and open the document in
+    `__init__`. Pages are only parsed when `page_text` is called.
+    """
+
+    name = ""
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Return True if the backing library is installed"""
+        raise NotImplementedError
+
+    @property
+    def page_count(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def is_encrypted(self) -> bool:
+        """True if the document cannot be read without a password"""
+        raise NotImplementedError
+
+    def page_text(self, page_num: int) -> str:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def _read_source(source: PdfSource) -> bytes:
+    """Return the raw bytes of a path, bytes object or binary stream"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, str):
+        with open(source, 'rb') as file:
+            return file.read()
+    source.seek(0)
+    return source.read()
+
+def _source_size(source: PdfSource) -> int:
+    """Return the size in bytes of a path, bytes object or binary stream"""
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    if isinstance(source, str):
+        return os.path.getsize(source)
+    position = source.tell()
+    size = source.seek(0, io.SEEK_END)
+    source.seek(position)
+    return size
+
+@register_backend
+class PypdfBackend(ExtractionBackend):
+    """
+    Pure-Python extraction with pypdf, falling back to PyPDF2
+
+    Files on disk are memory-mapped rather than read into memory, which pypdf
+    does when given a path.
+    """
+
+    name = "pypdf"
+
+    def __init__(self, source: PdfSource):
+        module = self._module()
+        self._file = self._mmap = None
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        elif isinstance(source, str):
+            self._file = open(source, 'rb')
+            try:
+                self._mmap = source = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                source = self._file
+        try:
+            self._reader = module.PdfReader(source)
+        except Exception:
+            self.close()
+            raise
+        # Like the native backends, open documents encrypted with an empty
+        # user password instead of treating them as locked
+        self._locked = False
+        if self._reader.is_encrypted:
+            try:
+                self._locked = not self._reader.decrypt("")
+            except Exception:
+                self._locked = True
+
+    @staticmethod
+    def _module():
+        try:
+            import pypdf
+            return pypdf
+        except ImportError:
+            import PyPDF2
+            return PyPDF2
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            cls._module()
+            return True
+        except ImportError:
+            return False
+
+    @property
+    def page_count(self) -> int:
+        return len(self._reader.pages)
+
+    @property
+    def is_encrypted(self) -> bool:
+        return self._locked
+
+    def page_text(self, page_num: int) -> str:
+        return self._reader.pages[page_num].extract_text() or ""
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+@register_backend
+class PyMuPDFBackend(ExtractionBackend):
+    """Native extraction with PyMuPDF (MuPDF)"""
+
+    name = "pymupdf"
+
+    def __init__(self, source: PdfSource):
+        pymupdf = self._module()
+        if isinstance(source, str):
+            self._document = pymupdf.open(source)
+        else:
+            self._document = pymupdf.open(stream=_read_source(source), filetype="pdf")
+
+    @staticmethod
+    def _module():
+        try:
+            import pymupdf
+        except ImportError:
+            import fitz as pymupdf
+        return pymupdf
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            cls._module()
+            return True
+        except ImportError:
+            return False
+
+    @property
+    def page_count(self) -> int:
+        return self._document.page_count
+
+    @property
+    def is_encrypted(self) -> bool:
+        return bool(self._document.needs_pass)
+
+    def page_text(self, page_num: int) -> str:
+        return self._document.load_page(page_num).get_text()
+
+    def close(self) -> None:
+        self._document.close()
+
+@register_backend
+class PdfiumBackend(ExtractionBackend):
+    """Native extraction with pypdfium2 (PDFium)"""
+
+    name = "pypdfium2"
+
+    def __init__(self, source: PdfSource):
+        import pypdfium2
+        self._encrypted = False
+        try:
+            self._document = pypdfium2.PdfDocument(source if isinstance(source, str) else _read_source(source))
+        except pypdfium2.PdfiumError as e:
+            if "password" not in str(e).lower():
+                raise
+            self._encrypted = True
+            self._document = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import pypdfium2
+            return True
+        except ImportError:
+            return False
+
+    @property
+    def page_count(self) -> int:
+        return len(self._document) if self._document is not None else 0
+
+    @property
+    def is_encrypted(self) -> bool:
+        return self._encrypted
+
+    def page_text(self, page_num: int) -> str:
+        page = self._document[page_num]
+        try:
+            text_page = page.get_textpage()
+            try:
+                return text_page.get_text_range()
+            finally:
+                text_page.close()
+        finally:
+            page.close()
+
+    def close(self) -> None:
+        if self._document is not None:
+            self._document.close()
+
+def available_backends() -> List[str]:
+    """
+    List the registered backends whose libraries are installed
+
+    Returns:
+        List[str]: Backend names, default backend first
+    """
+    names = [name for name, backend_cls in BACKENDS.items() if backend_cls.is_available()]
+    return sorted(names, key=lambda name: name != DEFAULT_BACKEND)
+
+def get_backend(name: str) -> Type[ExtractionBackend]:
+    """
+    Look up an installed backend by name
+
+    Args:
+        name (str): Registered backend name
+
+    Returns:
+        Type[ExtractionBackend]: Backend class
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown extraction backend '{name}', expected one of {sorted(BACKENDS)} or 'auto'")
+    if not BACKENDS[name].is_available():
+        raise ValueError(f"Extraction backend '{name}' is not installed")
+    return BACKENDS[name]
+
+def open_backend(source: PdfSource, name: str = None) -> ExtractionBackend:
+    """
+    Open a document with the chosen extraction backend
+
+    In auto mode, small documents use the default backend. Larger documents
+    are probed with every installed backend on a few pages sampled across
+    the document, so a blank or image-only cover page does not disqualify a
+    backend. The fastest backend that returns text is kept open and returned,
+    so the document is not parsed a second time.
+
+    Args:
+        source (PdfSource): Path, bytes or binary stream of the PDF
+        name (str): Backend name or "auto"; defaults to EXTRACTION_BACKEND
+
+    Returns:
+        ExtractionBackend: Open document; the caller closes it
+    """
+    name = name or EXTRACTION_BACKEND
+    if name != "auto":
+        return get_backend(name)(source)
+
+    candidates = available_backends()
+    if len(candidates) == 1 or _source_size(source) < AUTO_PROBE_MIN_BYTES:
+        return get_backend(candidates[0])(source)
+
+    best, best_time = None, float("inf")
+    # Native backends first, so the slower default backend can stop probing
+    # as soon as it falls behind
+    for candidate in reversed(candidates):
+        start = time.perf_counter()
+        try:
+            document = BACKENDS[candidate](source)
+        except Exception:
+            continue
+        if _probe(document, start, best_time):
+            if best is not None:
+                best.close()
+            best, best_time = document, time.perf_counter() - start
+        else:
+            document.close()
+
+    if best is None:
+        return get_backend(candidates[0])(source)
+    return best
+
+def _probe(document: ExtractionBackend, start: float, time_limit: float) -> bool:
+    """
+    Extract the probe pages of an open document
+
+    Args:
+        document (ExtractionBackend): Open document
+        start (float): perf_counter value when opening the document started
+        time_limit (float): Give up once this many seconds have passed since start
+
+    Returns:
+        bool: True if the probe pages were extracted within the time limit and
+            at least one of them has text
+    """
+    try:
+        if document.is_encrypted or document.page_count == 0:
+            return False
+        last_page = document.page_count - 1
+        pages = sorted({round(i * last_page / max(1, AUTO_PROBE_PAGES - 1)) for i in range(AUTO_PROBE_PAGES)})
+
+        found_text = False
+        for page_num in pages:
+            found_text = bool(document.page_text(page_num).strip()) or found_text
+            if time.perf_counter() - start > time_limit:
+                return False
+        return found_text
+    except Exception:
+        return False
@@ -0,0 +1,222 @@
+import hashlib
+import io
+import os
+import resource
+import shutil
+import tempfile
+import threading
+import weakref
+from typing import BinaryIO, Dict, Hashable, List, Optional, Tuple
+
+# Byte budgets for uploads held by one session
+MAX_FILE_BYTES = int(os.getenv("MAX_UPLOAD_FILE_BYTES", str(200 * 1024 * 1024)))
+MAX_SESSION_BYTES = int(os.getenv("MAX_SESSION_UPLOAD_BYTES", str(500 * 1024 * 1024)))
+
+# Uploads are copied to disk in chunks of this size, so spooling never holds
+# more than one chunk in memory
+SPOOL_CHUNK_BYTES = 1024 * 1024
+
+class UploadBudgetError(Exception):
+    """Raised when an upload would exceed the per-file or per-session byte budget"""
+
+class SpooledUpload:
+    """An uploaded file spooled to disk once, with the SHA-256 of its content"""
+
+    def __init__(self, name: str, path: str, size: int, sha256: str, key: Hashable = None):
+        self.name = name
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.key = key
+
+def stream_sha256(stream: BinaryIO) -> str:
+    """
+    SHA-256 of a seekable binary stream, read in chunks
+
+    Args:
+        stream (BinaryIO): Seekable binary stream; it is rewound afterwards
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(SPOOL_CHUNK_BYTES), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+def current_rss_mb() -> float:
+    """
+    Resident set size of this process in MB
+
+    Returns:
+        float: Current RSS on Linux, peak RSS elsewhere
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        # Peak RSS is the best available measure outside Linux (bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e6
+
+class IngestionSession:
+    """
+    Disk-backed upload storage for one session with byte budgets
+
+    Each upload is streamed to a private spool directory once. Later stages
+    read it from disk (the extraction backends memory-map or open the file
+    themselves), so no extra in-memory copies of the upload are made.
+    The spool directory is removed when the session is closed or garbage
+    collected.
+
+    Streamlit's uploader holds every upload in memory before the app sees it,
+    so the per-file budget only bounds memory together with
+    server.maxUploadSize in the Streamlit config.
+    """
+
+    def __init__(self, max_file_bytes: int = MAX_FILE_BYTES, max_session_bytes: int = MAX_SESSION_BYTES):
+        self.max_file_bytes = max_file_bytes
+        self.max_session_bytes = max_session_bytes
+        self.spool_dir = tempfile.mkdtemp(prefix="pdf-synthesis-")
+        self._uploads: Dict[Hashable, SpooledUpload] = {}
+        self._lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.spool_dir, ignore_errors=True)
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes currently held on disk for this session"""
+        with self._lock:
+            return sum(upload.size for upload in self._uploads.values())
+
+    @property
+    def uploads(self) -> List[SpooledUpload]:
+        with self._lock:
+            return list(self._uploads.values())
+
+    @staticmethod
+    def upload_key(name: str, stream: BinaryIO, upload_id: Optional[str] = None) -> Hashable:
+        """
+        Identity of an upload within the session
+
+        Streamlit gives every uploaded file its own file_id, which is used when
+        available. Other streams are identified by name and content hash, so
+        different files with the same name and size are never merged.
+
+        Args:
+            name (str): Original filename
+            stream (BinaryIO): Seekable binary stream with the upload content
+            upload_id (Optional[str]): Uploader file ID, if any
+
+        Returns:
+            Hashable: Key of the upload
+        """
+        if upload_id is not None:
+            return ("id", upload_id)
+        return ("content", name, stream_sha256(stream))
+
+    def add(self, name: str, stream: BinaryIO, upload_id: Optional[str] = None) -> SpooledUpload:
+        """
+        Spool an upload to disk within the byte budgets
+
+        An upload already spooled under the same key (see upload_key) is not
+        stored again.
+
+        Args:
+            name (str): Original filename
+            stream (BinaryIO): Seekable binary stream with the upload content
+            upload_id (Optional[str]): Uploader file ID, such as Streamlit's UploadedFile.file_id
+
+        Returns:
+            SpooledUpload: The spooled upload
+
+        Raises:
+            UploadBudgetError: If the file or the session would exceed its budget
+        """
+        key = self.upload_key(name, stream, upload_id)
+        with self._lock:
+            existing = self._uploads.get(key)
+        if existing is not None:
+            return existing
+
+        size = stream.seek(0, io.SEEK_END)
+        stream.seek(0)
+
+        if size > self.max_file_bytes:
+            raise UploadBudgetError(f"{name} is {size / 1e6:.1f} MB, the per-file limit is "
+                                    f"{self.max_file_bytes / 1e6:.0f} MB")
+        if self.total_bytes + size > self.max_session_bytes:
+            raise UploadBudgetError(f"Adding {name} would exceed the {self.max_session_bytes / 1e6:.0f} MB "
+                                    f"session upload limit")
+
+        digest = hashlib.sha256()
+        fd, path = tempfile.mkstemp(suffix=".pdf", dir=self.spool_dir)
+        with os.fdopen(fd, 'wb') as spool_file:
+            for chunk in iter(lambda: stream.read(SPOOL_CHUNK_BYTES), b''):
+                digest.update(chunk)
+                spool_file.write(chunk)
+        stream.seek(0)
+
+        upload = SpooledUpload(name, path, size, digest.hexdigest(), key)
+        with self._lock:
+            self._uploads[key] = upload
+        return upload
+
+    def sync(self, uploaded_files) -> Tuple[List[SpooledUpload], List[Tuple[str, str]]]:
+        """
+        Match the spooled uploads to the files currently in the uploader
+
+        New files are spooled and files that were removed from the uploader
+        are deleted from disk, so the budget covers only the current set.
+
+        Args:
+            uploaded_files: Streamlit UploadedFile objects (or named binary streams)
+
+        Returns:
+            Tuple[List[SpooledUpload], List[Tuple[str, str]]]: Accepted uploads in
+                uploader order, and (filename, reason) for rejected files
+        """
+        upload_ids = [getattr(uploaded_file, "file_id", None) for uploaded_file in uploaded_files]
+        current = {self.upload_key(uploaded_file.name, uploaded_file, upload_id)
+                   for uploaded_file, upload_id in zip(uploaded_files, upload_ids)}
+
+        # Release spooled files no longer in the uploader before admitting new ones
+        for upload in self.uploads:
+            if upload.key not in current:
+                self.release(upload)
+
+        accepted, rejected = [], []
+        for uploaded_file, upload_id in zip(uploaded_files, upload_ids):
+            try:
+                accepted.append(self.add(uploaded_file.name, uploaded_file, upload_id))
+            except UploadBudgetError as e:
+                rejected.append((uploaded_file.name, str(e)))
+
+        return accepted, rejected
+
+    def release(self, upload: SpooledUpload) -> None:
+        """Delete a spooled upload and return its bytes to the session budget"""
+        with self._lock:
+            if self._uploads.pop(upload.key, None) is None:
+                return
+        try:
+            os.unlink(upload.path)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        """Delete all spooled uploads"""
+        with self._lock:
+            self._uploads.clear()
+        self._finalizer()
+
+    def memory_usage(self) -> Dict:
+        """
+        Returns:
+            Dict: Spooled bytes, session budget and process RSS in MB
+        """
+        return {
+            'spooled_mb': self.total_bytes / 1e6,
+            'budget_mb': self.max_session_bytes / 1e6,
+            'rss_mb': current_rss_mb()
+        }
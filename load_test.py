@@ -0,0 +1,313 @@
+"""
+Concurrent-session load test for the document processing pipeline
+
+Simulates N Streamlit sessions running the process_files pipeline at the
+same time in one process, as the Streamlit server does, against a local mock
+of the OpenAI chat completions API. The mock runs in its own process, so the
+CPU and RSS reported for each concurrency level, along with throughput and
+latency percentiles, are the pipeline's alone.
+
+Usage:
+    python load_test.py --concurrency 1,2,4,8,16 --mix small:3,medium:2,large:1
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+from ingestion import IngestionSession, current_rss_mb
+
+# Pages per generated upload for each size class in the upload mix
+UPLOAD_SIZES = {
+    "small": 3,
+    "medium": 30,
+    "large": 300,
+}
+
+SENTENCES = [
+    "The quarterly review shows steady growth in recurring revenue across all regions.",
+    "Operating costs increased due to investment in infrastructure and security.",
+    "Customer retention improved after the redesign of the onboarding process.",
+    "Regulatory changes in two markets introduce new reporting requirements.",
+    "The research team evaluated three forecasting methods against historical data.",
+    "Energy prices remain the largest source of uncertainty for the coming year.",
+]
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """Answers chat completion requests after a simulated model latency"""
+
+    latency_median = 1.0
+    latency_sigma = 0.5
+    # Length of a complete answer; smaller output budgets cut it off
+    completion_tokens = 200
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt_chars = sum(len(message['content']) for message in request['messages'])
+        max_tokens = request.get('max_tokens') or self.completion_tokens
+        completion_tokens = min(max_tokens, self.completion_tokens)
+
+        time.sleep(random.lognormvariate(0, self.latency_sigma) * self.latency_median)
+
+        body = json.dumps({
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request['model'],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "length" if max_tokens < self.completion_tokens else "stop",
+                "message": {"role": "assistant", "content": "Mock summary. " * (completion_tokens // 3)}
+            }],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_chars // 4 + completion_tokens
+            }
+        }).encode()
+
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client aborted the request, e.g. a hedged duplicate that lost the race
+            pass
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Sessions open many connections at once; the default backlog of 5 makes
+    # the overflow wait for TCP retransmits
+    request_queue_size = 128
+
+def start_mock_llm(latency_median: float, latency_sigma: float) -> ThreadingHTTPServer:
+    """
+    Start the mock OpenAI API on a free local port, in this process
+
+    Returns:
+        ThreadingHTTPServer: Running server; its base URL is http://127.0.0.1:<port>/v1
+    """
+    MockLLMHandler.latency_median = latency_median
+    MockLLMHandler.latency_sigma = latency_sigma
+    server = MockLLMServer(("127.0.0.1", 0), MockLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def _serve_mock_llm(latency_median: float, latency_sigma: float, ports) -> None:
+    """Run the mock OpenAI API until the process is terminated, reporting its port"""
+    server = start_mock_llm(latency_median, latency_sigma)
+    ports.put(server.server_address[1])
+    threading.Event().wait()
+
+def start_mock_llm_process(latency_median: float, latency_sigma: float) -> Tuple[multiprocessing.Process, int]:
+    """
+    Start the mock OpenAI API in a separate process
+
+    Its request handling then neither competes with the pipeline for the GIL
+    nor counts towards the measured CPU time and RSS.
+
+    Returns:
+        Tuple[multiprocessing.Process, int]: Server process and the port it listens on
+    """
+    context = multiprocessing.get_context("spawn")
+    ports = context.Queue()
+    process = context.Process(target=_serve_mock_llm, args=(latency_median, latency_sigma, ports),
+                              name="mock-llm", daemon=True)
+    process.start()
+    return process, ports.get(timeout=30)
+
+def generate_pdf(path: str, pages: int) -> None:
+    """Generate a text PDF with running headers and footers"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    rng = random.Random(pages)
+    pdf = canvas.Canvas(path, pagesize=A4)
+    for page_num in range(1, pages + 1):
+        pdf.drawString(72, 800, "Annual Operations Report")
+        for line in range(40):
+            pdf.drawString(72, 770 - line * 17, rng.choice(SENTENCES))
+        pdf.drawString(72, 40, f"Page {page_num} of {pages}")
+        pdf.showPage()
+    pdf.save()
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse an upload mix such as "small:3,large:1" into size class weights"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition(":")
+        if name not in UPLOAD_SIZES:
+            raise ValueError(f"Unknown upload size '{name}', expected one of {sorted(UPLOAD_SIZES)}")
+        weights[name] = int(weight or 1)
+    return weights
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def run_session(uploads: List[Tuple[str, bytes]]) -> float:
+    """
+    Run the process_files pipeline for one session's uploads
+
+    Like the app, triage runs on the session's own thread and every other
+    step runs on the shared pipeline worker pool, so sessions beyond
+    PIPELINE_WORKERS queue for workers as they do in the server.
+
+    Args:
+        uploads (List[Tuple[str, bytes]]): (filename, PDF bytes) pairs
+
+    Returns:
+        float: End-to-end latency in seconds
+    """
+    from pdf_preflight import triage_pdfs, STATUS_OK
+    from openai_service import synthesize_summaries, RunReport
+    from pdf_generator import create_summary_pdf
+    from pipeline import extract_document, summarize_document, run_pipeline_step, MAX_UPLOAD_BYTES
+    from cancellation import CancellationToken
+
+    started = time.perf_counter()
+    report = RunReport()
+    ingestion = IngestionSession()
+    cancel_token = CancellationToken()
+
+    try:
+        spooled = [ingestion.add(filename, io.BytesIO(data)) for filename, data in uploads]
+
+        triage = triage_pdfs([(str(i), upload.path) for i, upload in enumerate(spooled)],
+                             max_bytes=MAX_UPLOAD_BYTES)
+        accepted = sorted(int(result['name']) for result in triage[STATUS_OK])
+
+        summaries = []
+        for i in accepted:
+            text = run_pipeline_step(None, cancel_token, extract_document, spooled[i].path)
+            summaries.append(run_pipeline_step(None, cancel_token, summarize_document, text, spooled[i].name,
+                                               report=report))
+
+        synthesis = run_pipeline_step(None, cancel_token, synthesize_summaries, summaries, report=report)
+        run_pipeline_step(None, cancel_token, create_summary_pdf, summaries, synthesis)
+    finally:
+        cancel_token.cancel()
+        ingestion.close()
+
+    return time.perf_counter() - started
+
+def run_level(concurrency: int, sessions: int, corpus: Dict[str, bytes], weights: Dict[str, int],
+              docs_per_session: int, seed: int) -> Dict:
+    """
+    Run a number of sessions with a fixed number of them in flight at once
+
+    Returns:
+        Dict: Throughput, latency percentiles, CPU utilization, RSS, error count
+            and error counts by cause
+    """
+    rng = random.Random(seed)
+    names, counts = zip(*weights.items())
+    session_uploads = []
+    for _ in range(sessions):
+        picks = rng.choices(names, weights=counts, k=docs_per_session)
+        session_uploads.append([(f"{name}-{n}.pdf", corpus[name]) for n, name in enumerate(picks)])
+
+    latencies = []
+    errors = Counter()
+    peak_rss = current_rss_mb()
+    stop_sampling = threading.Event()
+
+    def sample_rss():
+        nonlocal peak_rss
+        while not stop_sampling.wait(0.1):
+            peak_rss = max(peak_rss, current_rss_mb())
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(run_session, uploads) for uploads in session_uploads]:
+            try:
+                latencies.append(future.result())
+            except Exception as e:
+                errors[f"{type(e).__name__}: {str(e)}"] += 1
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+
+    stop_sampling.set()
+    sampler.join()
+
+    return {
+        'concurrency': concurrency,
+        'sessions': sessions,
+        'errors': sum(errors.values()),
+        'error_causes': errors,
+        'throughput': len(latencies) / wall,
+        'p50': percentile(latencies, 50) if latencies else float("nan"),
+        'p95': percentile(latencies, 95) if latencies else float("nan"),
+        'p99': percentile(latencies, 99) if latencies else float("nan"),
+        'cpu': 100 * cpu / wall,
+        'rss': peak_rss
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,2,4,8,16",
+                        help="Comma-separated numbers of simultaneous sessions")
+    parser.add_argument("--sessions-per-level", type=int, default=0,
+                        help="Sessions to run per level (default: 3x the concurrency, at least 10)")
+    parser.add_argument("--mix", default="small:3,medium:2,large:1",
+                        help="Upload size classes and weights, e.g. small:3,medium:2,large:1")
+    parser.add_argument("--docs-per-session", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=1.0,
+                        help="Median mock LLM latency in seconds")
+    parser.add_argument("--llm-latency-sigma", type=float, default=0.5,
+                        help="Log-normal spread of the mock LLM latency")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    mock_llm, port = start_mock_llm_process(args.llm_latency, args.llm_latency_sigma)
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "mock-key")
+
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        corpus = {}
+        for name in weights:
+            path = os.path.join(corpus_dir, f"{name}.pdf")
+            generate_pdf(path, UPLOAD_SIZES[name])
+            with open(path, 'rb') as file:
+                corpus[name] = file.read()
+            print(f"Upload '{name}': {UPLOAD_SIZES[name]} pages, {len(corpus[name]):,} bytes")
+
+    print(f"\n{'sessions':>8} {'conc':>5} {'ok/s':>7} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} "
+          f"{'CPU %':>7} {'RSS MB':>8} {'errors':>7}")
+    for concurrency in levels:
+        sessions = args.sessions_per_level or max(10, 3 * concurrency)
+        result = run_level(concurrency, sessions, corpus, weights, args.docs_per_session, args.seed)
+        print(f"{result['sessions']:>8} {result['concurrency']:>5} {result['throughput']:>7.2f} "
+              f"{result['p50']:>7.2f} {result['p95']:>7.2f} {result['p99']:>7.2f} "
+              f"{result['cpu']:>7.0f} {result['rss']:>8.0f} {result['errors']:>7}")
+        for cause, count in result['error_causes'].most_common():
+            print(f"{'':>8} {count:>5} x {cause}")
+
+    mock_llm.terminate()
+    mock_llm.join()
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
 import os
-from openai import OpenAI
-from typing import List, Dict
+import asyncio
+import hashlib
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import CancelledError as FutureCancelledError
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+from typing import List, Dict, Optional, Tuple
+from text_compressor import compress_text, estimate_tokens
+from cancellation import CancellationToken, CancelledError, check_cancelled
 
 # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
 # do not change this unless explicitly requested by the user
@@ -11,90 +19,54 @@ if not OPENAI_API_KEY:
 
 client = OpenAI(api_key=OPENAI_API_KEY)
 
-def summarize_text(text: str, filename: str = "") -> str:
-    """
-    Generate a summary of the provided text using OpenAI
-    
-    Args:
-        text (str): Text content to summarize
-        filename (str): Optional filename for context
-        
-    Returns:
-        str: Generated summary
-        
-    Raises:
-        Exception: If OpenAI API call fails
-    """
-    try:
-        # Truncate text if too long (OpenAI has token limits)
-        max_chars = 12000  # Conservative limit to stay within token limits
-        if len(text) > max_chars:
-            text = text[:max_chars] + "... [text truncated]"
-        
-        prompt = f"""Please provide a comprehensive summary of the following document{f' ({filename})' if filename else ''}. 
+# Token budget for the local extractive pre-compression stage
+EXTRACTIVE_TOKEN_BUDGET = 2800
+
+# Model routing: short documents are summarized by the fast model, everything
+# else, including synthesis, uses the default model
+DEFAULT_MODEL = "gpt-4o"
+FAST_MODEL = os.getenv("OPENAI_FAST_MODEL", "gpt-4o-mini")
+FAST_MODEL_MAX_INPUT_TOKENS = int(os.getenv("OPENAI_FAST_MODEL_MAX_INPUT_TOKENS", "1500"))
+
+# Output budgets in tokens. The synthesis prompt asks for themes, a comparison
+# table, outliers and a summary of every document, so its budget never drops
+# below the 1200 tokens it had before routing and grows with the document count
+SUMMARY_MAX_TOKENS = 600
+SUMMARY_MIN_TOKENS = 200
+SYNTHESIS_MAX_TOKENS = 2400
+SYNTHESIS_MIN_TOKENS = 1200
+SYNTHESIS_TOKENS_PER_DOCUMENT = 250
+
+# A response cut off by its output budget is retried once with these budgets,
+# so a call costs at most two requests
+SUMMARY_RETRY_MAX_TOKENS = 1200
+SYNTHESIS_RETRY_MAX_TOKENS = 4096
+
+# Price in USD per million (input, output) tokens, used for cost reporting
+MODEL_PRICING = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+# Prompts. Changing any of them changes the prompt versions below, so stored
+# summaries and syntheses made with older prompts are no longer reused.
+SUMMARY_SYSTEM_PROMPT = "You are an expert document analyzer and summarizer. Create clear, comprehensive summaries that capture the essence of documents while maintaining important details."
+
+SUMMARY_PROMPT_TEMPLATE = """Please provide a comprehensive summary of the following document{document_label}. 
 
 The summary should:
 - Capture the main topics and key points
 - Be well-structured with clear sections
 - Include important details and findings
-- Be approximately 200-400 words
+- Be approximately {min_words}-{max_words} words
 - Use clear, professional language
 
 Document content:
 {text}"""
 
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "You are an expert document analyzer and summarizer. Create clear, comprehensive summaries that capture the essence of documents while maintaining important details."
-                },
-                {
-                    "role": "user", 
-                    "content": prompt
-                }
-            ],
-            max_tokens=600,
-            temperature=0.3
-        )
-        
-        summary = response.choices[0].message.content
-        if summary:
-            summary = summary.strip()
-        
-        if not summary:
-            raise Exception("OpenAI returned an empty summary")
-            
-        return summary
-        
-    except Exception as e:
-        raise Exception(f"Failed to generate summary: {str(e)}")
+SYNTHESIS_SYSTEM_PROMPT = "You are an expert analyst who specializes in synthesizing information from multiple sources. Create comprehensive, well-structured analyses that reveal insights and connections across documents."
 
-def synthesize_summaries(summaries: List[Dict]) -> str:
-    """
-    Create a comprehensive synthesis from multiple document summaries
-    
-    Args:
-        summaries (List[Dict]): List of summary dictionaries with 'filename' and 'summary' keys
-        
-    Returns:
-        str: Comprehensive synthesis
-        
-    Raises:
-        Exception: If OpenAI API call fails
-    """
-    try:
-        if not summaries:
-            raise Exception("No summaries provided for synthesis")
-        
-        # Prepare the summaries text
-        summaries_text = ""
-        for i, summary_data in enumerate(summaries, 1):
-            summaries_text += f"\n\nDocument {i}: {summary_data['filename']}\n"
-            summaries_text += f"Summary: {summary_data['summary']}"
-        
-        prompt = f"""I have {len(summaries)} document summaries that I need you to synthesize. Please follow these exact formatting instructions:
+SYNTHESIS_PROMPT_TEMPLATE = """I have {document_count} document summaries that I need you to synthesize. Please follow these exact formatting instructions:
 
 1. Extract and understand the **main ideas, themes, and insights** from each document.
 2. Create a structured synthesis that includes:
@@ -141,19 +113,499 @@ Stay neutral, avoid repetition, and be precise. Assume your audience is analytic
 Here are the individual document summaries:
 {summaries_text}"""
 
-        response = client.chat.completions.create(
-            model="gpt-4o",
+# Conservative limit on summary input to stay within token limits
+SUMMARY_MAX_INPUT_CHARS = 12000
+
+# Bump to invalidate stored results after a change the prompt text does not show
+PROMPT_REVISION = 1
+
+# The versions cover the prompts, the input budgets and the routing settings,
+# so the model and output budget of a stored result follow from its version
+
+def _prompt_version(*parts) -> str:
+    """Short stable hash identifying a prompt and the settings that shape its input"""
+    return hashlib.sha256("\x00".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:12]
+
+SUMMARY_PROMPT_VERSION = _prompt_version(PROMPT_REVISION, SUMMARY_SYSTEM_PROMPT, SUMMARY_PROMPT_TEMPLATE,
+                                         EXTRACTIVE_TOKEN_BUDGET, SUMMARY_MAX_INPUT_CHARS,
+                                         DEFAULT_MODEL, FAST_MODEL, FAST_MODEL_MAX_INPUT_TOKENS,
+                                         SUMMARY_MIN_TOKENS, SUMMARY_MAX_TOKENS, SUMMARY_RETRY_MAX_TOKENS)
+SYNTHESIS_PROMPT_VERSION = _prompt_version(PROMPT_REVISION, SYNTHESIS_SYSTEM_PROMPT, SYNTHESIS_PROMPT_TEMPLATE,
+                                           DEFAULT_MODEL, SYNTHESIS_MIN_TOKENS, SYNTHESIS_MAX_TOKENS,
+                                           SYNTHESIS_TOKENS_PER_DOCUMENT, SYNTHESIS_RETRY_MAX_TOKENS)
+
+# Per-call deadlines in seconds
+SUMMARY_DEADLINE = float(os.getenv("OPENAI_SUMMARY_DEADLINE", "60"))
+SYNTHESIS_DEADLINE = float(os.getenv("OPENAI_SYNTHESIS_DEADLINE", "120"))
+
+# Hedging: when a summary request is slower than this latency percentile,
+# a duplicate request is sent and whichever returns first is used
+HEDGE_ENABLED = os.getenv("OPENAI_HEDGE", "1") == "1"
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 20
+
+# Circuit breaker: after this many consecutive upstream failures, calls fail
+# fast for the cooldown period before a single trial call is let through
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+
+class LatencyTracker:
+    """Rolling window of recent request latencies"""
+    
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+    
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+    
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Return the latency at the given percentile
+        
+        Returns:
+            Optional[float]: Latency in seconds, or None until enough samples are recorded
+        """
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            samples = sorted(self._samples)
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+class CircuitBreaker:
+    """Fail fast while the upstream API is degraded"""
+    
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Return True if a call may be attempted"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.cooldown:
+                # Half-open: let one trial call through and restart the cooldown
+                self._opened_at = time.monotonic()
+                return True
+            return False
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+class RunReport:
+    """Routing decisions, latency, token usage and cost of the calls in one run"""
+    
+    def __init__(self):
+        self.calls: List[Dict] = []
+        self._lock = threading.Lock()
+    
+    def record(self, route: Dict, label: str, latency: float, usage) -> None:
+        """
+        Record one completed call
+        
+        Args:
+            route (Dict): Routing decision from route_request
+            label (str): What the call was for, e.g. the document filename
+            latency (float): End-to-end call latency in seconds
+            usage: Token usage reported by the API, if any
+        """
+        input_tokens = usage.prompt_tokens if usage else route['input_tokens']
+        output_tokens = usage.completion_tokens if usage else 0
+        input_price, output_price = MODEL_PRICING.get(route['model'], (0.0, 0.0))
+        
+        with self._lock:
+            self.calls.append({
+                'kind': route['kind'],
+                'label': label,
+                'model': route['model'],
+                'max_tokens': route['max_tokens'],
+                'input_tokens': input_tokens,
+                'output_tokens': output_tokens,
+                'latency': latency,
+                'cost': (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+            })
+    
+    def totals(self) -> Dict:
+        """
+        Returns:
+            Dict: Number of calls, total tokens, summed latency and cost, and calls per model
+        """
+        with self._lock:
+            calls = list(self.calls)
+        models = defaultdict(int)
+        for call in calls:
+            models[call['model']] += 1
+        return {
+            'calls': len(calls),
+            'input_tokens': sum(call['input_tokens'] for call in calls),
+            'output_tokens': sum(call['output_tokens'] for call in calls),
+            'latency': sum(call['latency'] for call in calls),
+            'cost': sum(call['cost'] for call in calls),
+            'models': dict(models)
+        }
+
+def route_request(kind: str, input_tokens: int, document_count: int = 1) -> Dict:
+    """
+    Choose the model and output budget for a request
+    
+    Args:
+        kind (str): "summary" or "synthesis"
+        input_tokens (int): Estimated prompt size in tokens
+        document_count (int): Number of documents covered by the request
+        
+    Returns:
+        Dict: Routing decision with 'kind', 'model', 'max_tokens' and 'input_tokens'
+    """
+    if kind == "summary":
+        model = FAST_MODEL if input_tokens <= FAST_MODEL_MAX_INPUT_TOKENS else DEFAULT_MODEL
+        # A summary rarely needs more than half the length of its source
+        max_tokens = max(SUMMARY_MIN_TOKENS, min(SUMMARY_MAX_TOKENS, input_tokens // 2))
+    elif kind == "synthesis":
+        model = DEFAULT_MODEL
+        max_tokens = max(SYNTHESIS_MIN_TOKENS,
+                         min(SYNTHESIS_MAX_TOKENS, 400 + SYNTHESIS_TOKENS_PER_DOCUMENT * document_count))
+    else:
+        raise ValueError(f"Unknown request kind '{kind}'")
+    
+    return {
+        'kind': kind,
+        'model': model,
+        'max_tokens': max_tokens,
+        'input_tokens': input_tokens
+    }
+
+_latency = defaultdict(LatencyTracker)
+_breaker = CircuitBreaker()
+
+# Completion calls run as coroutines on one background event loop with a
+# shared async client, so connections are pooled across calls and an
+# in-flight request is aborted as soon as its task is cancelled
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name="openai-loop", daemon=True).start()
+async_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+_in_flight = 0
+
+class DeadlineExceeded(Exception):
+    """Raised when the upstream API does not respond within a call's deadline"""
+
+def in_flight_requests() -> int:
+    """
+    Returns:
+        int: Number of completion requests currently open against the API
+    """
+    return _in_flight
+
+def _is_upstream_failure(error: Exception) -> bool:
+    """Return True for errors that indicate a degraded upstream rather than a bad request"""
+    return isinstance(error, (APIConnectionError, APITimeoutError, InternalServerError,
+                              RateLimitError, DeadlineExceeded))
+
+async def _attempt(request: Dict):
+    """Send one completion request and record its latency"""
+    global _in_flight
+    _in_flight += 1
+    started = time.monotonic()
+    try:
+        response = await async_client.chat.completions.create(**request)
+    finally:
+        _in_flight -= 1
+    _latency[request['model']].record(time.monotonic() - started)
+    return response
+
+async def _complete(deadline: float, hedge_after: Optional[float], request: Dict):
+    """
+    Await the first successful attempt, hedging once if the first is slow
+
+    The deadline and hedge point are measured from when this coroutine starts
+    running. Attempts still open when it returns, fails or is cancelled are
+    cancelled, which closes their connections.
+    """
+    loop = asyncio.get_running_loop()
+    deadline_at = loop.time() + deadline
+    hedge_at = loop.time() + hedge_after if hedge_after is not None else None
+    attempts = {asyncio.ensure_future(_attempt(request))}
+    last_error = None
+
+    try:
+        while attempts:
+            now = loop.time()
+            if now >= deadline_at:
+                raise DeadlineExceeded(f"OpenAI did not respond within {deadline:g} seconds")
+
+            done, attempts = await asyncio.wait(attempts, timeout=min(deadline_at, hedge_at or deadline_at) - now,
+                                                return_when=asyncio.FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is None:
+                    return attempt.result()
+                last_error = attempt.exception()
+
+            if hedge_at is not None and attempts and loop.time() >= hedge_at:
+                hedge_at = None
+                attempts.add(asyncio.ensure_future(_attempt(request)))
+
+        raise last_error
+    finally:
+        for attempt in attempts:
+            attempt.cancel()
+
+def _create_completion(deadline: float, hedge: bool = False,
+                       cancel_token: Optional[CancellationToken] = None, **request):
+    """
+    Run a chat completion with a deadline, optional hedging and a circuit breaker
+    
+    The call runs on the shared event loop. Cancelling the token, passing the
+    deadline or losing a hedged race cancels the request's task, which aborts
+    the HTTP request instead of waiting for the response.
+    
+    Args:
+        deadline (float): Seconds to wait for a response once the call starts
+        hedge (bool): Send a duplicate request if the first one is slow
+        cancel_token (Optional[CancellationToken]): Aborts the call when cancelled
+        **request: Arguments for client.chat.completions.create
+        
+    Returns:
+        The first successful chat completion response
+        
+    Raises:
+        CancelledError: If the cancellation token was cancelled
+        Exception: If the circuit is open, the deadline passes or the call fails
+    """
+    check_cancelled(cancel_token)
+    if not _breaker.allow():
+        raise Exception("OpenAI is currently unavailable, please try again shortly")
+    
+    hedge_after = _latency[request['model']].percentile(HEDGE_PERCENTILE) if hedge and HEDGE_ENABLED else None
+    if hedge_after is not None and hedge_after >= deadline:
+        hedge_after = None
+    
+    future = asyncio.run_coroutine_threadsafe(_complete(deadline, hedge_after, dict(request, timeout=deadline)),
+                                              _loop)
+    if cancel_token is not None:
+        cancel_token.add_callback(future.cancel)
+    
+    try:
+        response = future.result()
+    except FutureCancelledError:
+        raise CancelledError("Operation was cancelled")
+    except Exception as e:
+        if _is_upstream_failure(e):
+            _breaker.record_failure()
+        raise
+    finally:
+        if cancel_token is not None:
+            cancel_token.remove_callback(future.cancel)
+    
+    _breaker.record_success()
+    return response
+
+def prepare_summary_input(text: str, compress: bool = False) -> Tuple[str, Dict]:
+    """
+    Compress and truncate document text to the summary input budget and route it
+    
+    Args:
+        text (str): Text content to summarize
+        compress (bool): Keep only the most salient sentences of the whole
+            document instead of its first characters
+        
+    Returns:
+        Tuple[str, Dict]: Prompt input text and the routing decision from route_request
+    """
+    if compress:
+        text = compress_text(text, EXTRACTIVE_TOKEN_BUDGET)
+    
+    # Truncate text if too long (OpenAI has token limits)
+    if len(text) > SUMMARY_MAX_INPUT_CHARS:
+        text = text[:SUMMARY_MAX_INPUT_CHARS] + "... [text truncated]"
+    
+    return text, route_request("summary", estimate_tokens(text))
+
+def _format_summaries(summaries: List[Dict]) -> str:
+    """Format document summaries for the synthesis prompt"""
+    summaries_text = ""
+    for i, summary_data in enumerate(summaries, 1):
+        summaries_text += f"\n\nDocument {i}: {summary_data['filename']}\n"
+        summaries_text += f"Summary: {summary_data['summary']}"
+    return summaries_text
+
+def synthesis_route(summaries: List[Dict]) -> Dict:
+    """
+    Return the routing decision synthesize_summaries would make
+    
+    Args:
+        summaries (List[Dict]): List of summary dictionaries with 'filename' and 'summary' keys
+        
+    Returns:
+        Dict: Routing decision from route_request
+    """
+    prompt = SYNTHESIS_PROMPT_TEMPLATE.format(document_count=len(summaries),
+                                              summaries_text=_format_summaries(summaries))
+    return route_request("synthesis", estimate_tokens(prompt), len(summaries))
+
+def _create_untruncated_completion(deadline: float, route: Dict, label: str, retry_max_tokens: int,
+                                   hedge: bool = False, cancel_token: Optional[CancellationToken] = None,
+                                   report: Optional[RunReport] = None, **request):
+    """
+    Run a routed chat completion, retrying once with retry_max_tokens if it was cut off
+    
+    Args:
+        deadline (float): Seconds to wait for each response once the call starts
+        route (Dict): Routing decision from route_request
+        label (str): Name of the call in the run report
+        retry_max_tokens (int): Output budget for the retry
+        hedge (bool): Send a duplicate request if the first one is slow
+        cancel_token (Optional[CancellationToken]): Aborts the call when cancelled
+        report (Optional[RunReport]): Collects the routing decision, latency and cost
+        **request: Other arguments for client.chat.completions.create
+        
+    Returns:
+        A chat completion response that finished within its output budget
+        
+    Raises:
+        CancelledError: If the cancellation token was cancelled
+        Exception: If the call fails or the response is still cut off after the retry
+    """
+    budgets = [route['max_tokens']]
+    if retry_max_tokens > route['max_tokens']:
+        budgets.append(retry_max_tokens)
+    
+    for max_tokens in budgets:
+        started = time.monotonic()
+        response = _create_completion(deadline, hedge=hedge, cancel_token=cancel_token,
+                                      model=route['model'], max_tokens=max_tokens, **request)
+        if report is not None:
+            report.record(dict(route, max_tokens=max_tokens), label, time.monotonic() - started, response.usage)
+        
+        if response.choices[0].finish_reason != "length":
+            return response
+    
+    raise Exception(f"OpenAI response was cut off at the {max_tokens} token output limit")
+
+def summarize_text(text: str, filename: str = "", compress: bool = False,
+                   cancel_token: Optional[CancellationToken] = None,
+                   report: Optional[RunReport] = None, route: Optional[Dict] = None) -> str:
+    """
+    Generate a summary of the provided text using OpenAI
+    
+    Args:
+        text (str): Text content to summarize
+        filename (str): Optional filename for context
+        compress (bool): Keep only the most salient sentences of the whole
+            document instead of its first characters
+        cancel_token (Optional[CancellationToken]): Aborts the request when cancelled
+        report (Optional[RunReport]): Collects the routing decision, latency and cost
+        route (Optional[Dict]): Routing decision from prepare_summary_input; when
+            given, text is the input it returned and is not prepared again
+        
+    Returns:
+        str: Generated summary
+        
+    Raises:
+        CancelledError: If the cancellation token was cancelled
+        Exception: If OpenAI API call fails
+    """
+    try:
+        if route is None:
+            text, route = prepare_summary_input(text, compress)
+        # Keep the requested length within the output budget (about 0.75 words per token)
+        max_words = min(400, route['max_tokens'] * 2 // 3)
+        min_words = min(200, max_words // 2)
+        
+        prompt = SUMMARY_PROMPT_TEMPLATE.format(document_label=f" ({filename})" if filename else "",
+                                                min_words=min_words, max_words=max_words, text=text)
+
+        response = _create_untruncated_completion(
+            SUMMARY_DEADLINE,
+            route,
+            filename,
+            SUMMARY_RETRY_MAX_TOKENS,
+            hedge=True,
+            cancel_token=cancel_token,
+            report=report,
+            messages=[
+                {
+                    "role": "system", 
+                    "content": SUMMARY_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user", 
+                    "content": prompt
+                }
+            ],
+            temperature=0.3
+        )
+        
+        summary = response.choices[0].message.content
+        if summary:
+            summary = summary.strip()
+        
+        if not summary:
+            raise Exception("OpenAI returned an empty summary")
+            
+        return summary
+        
+    except CancelledError:
+        raise
+    except Exception as e:
+        raise Exception(f"Failed to generate summary: {str(e)}")
+
+def synthesize_summaries(summaries: List[Dict], cancel_token: Optional[CancellationToken] = None,
+                         report: Optional[RunReport] = None) -> str:
+    """
+    Create a comprehensive synthesis from multiple document summaries
+    
+    Args:
+        summaries (List[Dict]): List of summary dictionaries with 'filename' and 'summary' keys
+        cancel_token (Optional[CancellationToken]): Aborts the request when cancelled
+        report (Optional[RunReport]): Collects the routing decision, latency and cost
+        
+    Returns:
+        str: Comprehensive synthesis
+        
+    Raises:
+        CancelledError: If the cancellation token was cancelled
+        Exception: If OpenAI API call fails
+    """
+    try:
+        if not summaries:
+            raise Exception("No summaries provided for synthesis")
+        
+        prompt = SYNTHESIS_PROMPT_TEMPLATE.format(document_count=len(summaries),
+                                                  summaries_text=_format_summaries(summaries))
+
+        route = route_request("synthesis", estimate_tokens(prompt), len(summaries))
+        
+        response = _create_untruncated_completion(
+            SYNTHESIS_DEADLINE,
+            route,
+            "Synthesis",
+            SYNTHESIS_RETRY_MAX_TOKENS,
+            cancel_token=cancel_token,
+            report=report,
             messages=[
                 {
                     "role": "system",
-                    "content": "You are an expert analyst who specializes in synthesizing information from multiple sources. Create comprehensive, well-structured analyses that reveal insights and connections across documents."
+                    "content": SYNTHESIS_SYSTEM_PROMPT
                 },
                 {
                     "role": "user",
                     "content": prompt
                 }
             ],
-            max_tokens=1200,
             temperature=0.3
         )
         
@@ -166,6 +618,8 @@ Here are the individual document summaries:
             
         return synthesis
         
+    except CancelledError:
+        raise
     except Exception as e:
         raise Exception(f"Failed to create synthesis: {str(e)}")
 
@@ -178,7 +632,7 @@ def validate_api_key() -> bool:
     """
     try:
         response = client.chat.completions.create(
-            model="gpt-4o",
+            model=DEFAULT_MODEL,
             messages=[{"role": "user", "content": "Hello"}],
             max_tokens=5
         )
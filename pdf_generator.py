@@ -5,18 +5,24 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from datetime import datetime
 import io
-from typing import List, Dict
+from typing import List, Dict, Optional
+from cancellation import CancellationToken, CancelledError, check_cancelled
 
-def create_summary_pdf(summaries: List[Dict], synthesis: str) -> io.BytesIO:
+def create_summary_pdf(summaries: List[Dict], synthesis: str,
+                       cancel_token: Optional[CancellationToken] = None) -> io.BytesIO:
     """
     Generate a PDF document containing the synthesis and individual summaries
     
     Args:
         summaries (List[Dict]): List of summary dictionaries
         synthesis (str): Comprehensive synthesis text
+        cancel_token (Optional[CancellationToken]): Stops the build between pages when cancelled
         
     Returns:
         io.BytesIO: PDF content as bytes buffer
+        
+    Raises:
+        CancelledError: If the cancellation token was cancelled
     """
     # Create a BytesIO buffer to hold the PDF
     buffer = io.BytesIO()
@@ -160,11 +166,16 @@ def create_summary_pdf(summaries: List[Dict], synthesis: str) -> io.BytesIO:
         alignment=1  # Center alignment
     )))
     
-    # Build the PDF
+    # Build the PDF, checking for cancellation as each page is laid out
+    def check_page(canvas, document):
+        check_cancelled(cancel_token)
+    
     try:
-        doc.build(story)
+        doc.build(story, onFirstPage=check_page, onLaterPages=check_page)
         buffer.seek(0)
         return buffer
+    except CancelledError:
+        raise
     except Exception as e:
         raise Exception(f"Error generating PDF: {str(e)}")
 
@@ -0,0 +1,290 @@
+import base64
+import binascii
+import io
+import os
+import re
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple, Union
+
+# Pre-flight classification of uploaded PDFs. Only the header, the trailer,
+# the cross-reference section and a small sample of content streams are read,
+# so a file is triaged in milliseconds before any full parse. A file is only
+# reported as having no text after the complete content of a few sampled
+# pages has been checked.
+
+STATUS_OK = "ok"
+STATUS_ENCRYPTED = "encrypted"
+STATUS_NO_TEXT = "no_text"
+STATUS_CORRUPT = "corrupt"
+STATUS_OVERSIZED = "oversized"
+
+HEADER_BYTES = 1024
+TRAILER_BYTES = 4096
+XREF_BYTES = 2048
+SAMPLE_BYTES = 1024 * 1024
+MAX_SAMPLED_STREAMS = 16
+MAX_INFLATED_BYTES = 256 * 1024
+
+# Nested form XObjects followed when checking a page's complete content
+MAX_FORM_DEPTH = 3
+
+_STARTXREF_RE = re.compile(rb'startxref\s+(\d+)')
+_STREAM_RE = re.compile(rb'(?<!end)stream\r?\n')
+_FILTER_RE = re.compile(rb'/Filter\s*(\[[^\]]*\]|/\w+)')
+_TEXT_OPERATOR_RE = re.compile(rb'(?:\)|>|\])\s*(?:Tj|TJ|\'|")')
+_NON_CONTENT_RE = re.compile(rb'/(?:Subtype\s*/Image|Type\s*/XRef|Type\s*/ObjStm|Type\s*/Metadata|Length1)')
+
+def preflight_pdf(source: Union[str, bytes], max_bytes: int = None) -> Dict:
+    """
+    Cheaply classify a PDF before any expensive parsing
+
+    Args:
+        source (Union[str, bytes]): Path to the PDF file or its content as bytes
+        max_bytes (int): Optional size limit; larger files are oversized
+
+    Returns:
+        Dict: Result with 'status' (one of the STATUS_* values), 'reason',
+            'size' in bytes and 'elapsed_ms'
+    """
+    start = time.perf_counter()
+
+    try:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            size = len(source)
+            status, reason = _classify(io.BytesIO(source), size, max_bytes)
+        else:
+            size = os.path.getsize(source)
+            with open(source, 'rb') as file:
+                status, reason = _classify(file, size, max_bytes)
+    except OSError as e:
+        size = 0
+        status, reason = STATUS_CORRUPT, f"File could not be read: {str(e)}"
+
+    return {
+        'status': status,
+        'reason': reason,
+        'size': size,
+        'elapsed_ms': (time.perf_counter() - start) * 1000
+    }
+
+def triage_pdfs(files: List[Tuple[str, Union[str, bytes]]], max_bytes: int = None) -> Dict[str, List[Dict]]:
+    """
+    Pre-flight a batch of PDFs and group them by status
+
+    Args:
+        files (List[Tuple[str, Union[str, bytes]]]): (name, path or bytes) pairs
+        max_bytes (int): Optional per-file size limit
+
+    Returns:
+        Dict[str, List[Dict]]: Pre-flight results keyed by status, each with a 'name' key
+    """
+    groups = {status: [] for status in (STATUS_OK, STATUS_ENCRYPTED, STATUS_NO_TEXT,
+                                        STATUS_CORRUPT, STATUS_OVERSIZED)}
+
+    for name, source in files:
+        result = preflight_pdf(source, max_bytes)
+        result['name'] = name
+        groups[result['status']].append(result)
+
+    return groups
+
+def _classify(file, size: int, max_bytes: int) -> Tuple[str, str]:
+    """
+    Classify an open PDF file object
+
+    Args:
+        file: Binary file object positioned anywhere
+        size (int): Total size of the file in bytes
+        max_bytes (int): Optional size limit
+
+    Returns:
+        Tuple[str, str]: Status and human-readable reason
+    """
+    if max_bytes is not None and size > max_bytes:
+        return STATUS_OVERSIZED, f"File is {size:,} bytes, limit is {max_bytes:,} bytes"
+
+    # Header: "%PDF-" must appear near the start of the file
+    file.seek(0)
+    header = file.read(HEADER_BYTES)
+    if b'%PDF-' not in header:
+        return STATUS_CORRUPT, "Missing PDF header"
+
+    # Trailer: the last startxref must point inside the file
+    file.seek(max(0, size - TRAILER_BYTES))
+    trailer = file.read(TRAILER_BYTES)
+    if b'%%EOF' not in trailer:
+        return STATUS_CORRUPT, "Missing end-of-file marker"
+
+    offsets = _STARTXREF_RE.findall(trailer)
+    if not offsets:
+        return STATUS_CORRUPT, "Missing startxref"
+    xref_offset = int(offsets[-1])
+    if xref_offset >= size:
+        return STATUS_CORRUPT, "Cross-reference offset points past the end of the file"
+
+    # Cross-reference section: a classic trailer dictionary or an xref stream dictionary
+    file.seek(xref_offset)
+    xref = file.read(XREF_BYTES)
+    if b'/Encrypt' in trailer or b'/Encrypt' in xref:
+        return STATUS_ENCRYPTED, "PDF is encrypted"
+
+    # Content sample: look for text-showing operators in the first streams
+    file.seek(0)
+    sample = file.read(SAMPLE_BYTES)
+    if size > SAMPLE_BYTES:
+        file.seek(max(SAMPLE_BYTES, size // 2 - SAMPLE_BYTES // 2))
+        sample += file.read(SAMPLE_BYTES)
+
+    if _sample_text_operators(sample):
+        return STATUS_OK, "Text layer found"
+
+    # The raw sample cannot follow a page's /Contents array, form XObjects or
+    # object streams, so check sampled pages in full before rejecting the file
+    pages_have_text = _sampled_pages_have_text(file)
+    if pages_have_text is None:
+        # Pages could not be inspected, leave the decision to extraction
+        return STATUS_OK, "Page content could not be inspected"
+    if pages_have_text:
+        return STATUS_OK, "Text layer found"
+    return STATUS_NO_TEXT, "No text layer found; the PDF appears to be image-only"
+
+def _sample_text_operators(data: bytes) -> bool:
+    """
+    Inspect the first content streams in a chunk of raw PDF bytes
+
+    Finding no text operators is not conclusive: the sampled streams may be
+    drawing streams of a page whose text is in another stream.
+
+    Args:
+        data (bytes): Raw PDF bytes
+
+    Returns:
+        bool: Whether text operators were found
+    """
+    inspected = 0
+
+    for match in _STREAM_RE.finditer(data):
+        if inspected >= MAX_SAMPLED_STREAMS:
+            break
+
+        # The stream dictionary sits just before the "stream" keyword
+        dict_start = data.rfind(b'<<', max(0, match.start() - 512), match.start())
+        stream_dict = data[dict_start:match.start()] if dict_start >= 0 else b''
+        if _NON_CONTENT_RE.search(stream_dict):
+            continue
+
+        end = data.find(b'endstream', match.end())
+        if end < 0:
+            break
+        content = data[match.end():end]
+
+        content = _decode_stream(stream_dict, content)
+        if content is None:
+            continue
+
+        inspected += 1
+        if _shows_text(content):
+            return True
+
+    return False
+
+def _shows_text(content: bytes) -> bool:
+    """Return True if decoded content stream data contains text-showing operators"""
+    return b'BT' in content and _TEXT_OPERATOR_RE.search(content) is not None
+
+def _sampled_pages_have_text(file) -> Optional[bool]:
+    """
+    Check the complete content of the first, middle and last page for text
+
+    A page's content includes every stream of its /Contents array and the
+    form XObjects it draws.
+
+    Args:
+        file: Binary file object of the PDF
+
+    Returns:
+        Optional[bool]: Whether any sampled page shows text, or None if the
+            pages could not be parsed
+    """
+    try:
+        import pypdf as pdf_module
+    except ImportError:
+        import PyPDF2 as pdf_module
+
+    try:
+        file.seek(0)
+        reader = pdf_module.PdfReader(file)
+        num_pages = len(reader.pages)
+        if num_pages == 0:
+            return None
+
+        for page_num in sorted({0, num_pages // 2, num_pages - 1}):
+            page = reader.pages[page_num]
+            contents = page.get_contents()
+            if contents is not None and _shows_text(contents.get_data()):
+                return True
+            if _forms_show_text(page.get('/Resources'), MAX_FORM_DEPTH):
+                return True
+    except Exception:
+        return None
+
+    return False
+
+def _forms_show_text(resources, depth: int) -> bool:
+    """
+    Check the form XObjects of a resource dictionary for text, recursively
+
+    Args:
+        resources: Resource dictionary (or indirect reference to one), or None
+        depth (int): Remaining levels of nested forms to follow
+
+    Returns:
+        bool: True if a form XObject shows text
+    """
+    if resources is None or depth == 0:
+        return False
+
+    xobjects = resources.get_object().get('/XObject')
+    if xobjects is None:
+        return False
+
+    for reference in xobjects.get_object().values():
+        xobject = reference.get_object()
+        if xobject.get('/Subtype') != '/Form':
+            continue
+        if _shows_text(xobject.get_data()) or _forms_show_text(xobject.get('/Resources'), depth - 1):
+            return True
+
+    return False
+
+def _decode_stream(stream_dict: bytes, content: bytes) -> Optional[bytes]:
+    """
+    Apply the ASCII85, ASCIIHex and Flate filters of a stream
+
+    Args:
+        stream_dict (bytes): Raw stream dictionary
+        content (bytes): Raw stream content
+
+    Returns:
+        Optional[bytes]: Decoded content, or None if a filter is unsupported
+            or the data is damaged
+    """
+    match = _FILTER_RE.search(stream_dict)
+    filters = re.findall(rb'/(\w+)', match.group(1)) if match else []
+
+    try:
+        for name in filters:
+            if name in (b'FlateDecode', b'Fl'):
+                content = zlib.decompressobj().decompress(content, MAX_INFLATED_BYTES)
+            elif name in (b'ASCII85Decode', b'A85'):
+                content = base64.a85decode(content.strip().rstrip(b'~>'))
+            elif name in (b'ASCIIHexDecode', b'AHx'):
+                content = binascii.unhexlify(re.sub(rb'\s', b'', content).rstrip(b'>'))
+            else:
+                # Image and font filters are not worth decoding in a pre-flight check
+                return None
+    except (zlib.error, ValueError, binascii.Error):
+        return None
+
+    return content
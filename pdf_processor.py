@@ -1,97 +1,266 @@
-import PyPDF2
-import io
 import re
+from collections import Counter
+from typing import List, Optional
+from text_compressor import CHARS_PER_TOKEN
+from extraction_backends import ExtractionBackend, open_backend
+from cancellation import CancellationToken, CancelledError, check_cancelled
+from pdf_preflight import preflight_pdf, STATUS_CORRUPT
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+# Supported page sampling strategies for budgeted extraction
+SAMPLING_STRATEGIES = ("first", "first_last", "even")
+
+# Header and footer detection settings
+HEADER_FOOTER_LINES = 2
+MIN_PAGES_FOR_HEADER_DETECTION = 3
+
+_HYPHENATED_BREAK_RE = re.compile(r'-(?<=\w-)[ \t]*\r?\n\s*(?=[a-z])')
+_DIGITS_RE = re.compile(r'\d+')
+
+def extract_text_from_pdf(pdf_path: str, max_pages: Optional[int] = None,
+                          max_chars: Optional[int] = None, max_tokens: Optional[int] = None,
+                          sampling: str = "first", backend: Optional[str] = None,
+                          dehyphenate: bool = False, remove_headers: bool = False,
+                          cancel_token: Optional[CancellationToken] = None) -> str:
     """
     Extract text content from a PDF file
     
+    Pages are parsed lazily and extraction stops as soon as the budget is
+    filled. Without a budget every page is extracted.
+    
     Args:
         pdf_path (str): Path to the PDF file
+        max_pages (Optional[int]): Maximum number of pages to parse
+        max_chars (Optional[int]): Stop once this many characters are extracted
+        max_tokens (Optional[int]): Stop once roughly this many tokens are extracted
+        sampling (str): Page sampling strategy, one of SAMPLING_STRATEGIES
+        backend (Optional[str]): Extraction backend name or "auto"; defaults
+            to the PDF_EXTRACTION_BACKEND setting
+        dehyphenate (bool): Rejoin words hyphenated across line breaks
+        remove_headers (bool): Drop running headers and footers repeated across pages
+        cancel_token (Optional[CancellationToken]): Stops extraction between pages when cancelled
         
     Returns:
         str: Extracted text content
         
     Raises:
+        CancelledError: If the cancellation token was cancelled
         Exception: If PDF cannot be read or processed
     """
-    try:
-        text = ""
+    with open_pdf(pdf_path, backend) as document:
+        return extract_text_from_document(document, max_pages, max_chars, max_tokens, sampling,
+                                          dehyphenate, remove_headers, cancel_token)
+
+def extract_text_from_pdf_bytes(pdf_bytes: bytes, max_pages: Optional[int] = None,
+                                max_chars: Optional[int] = None, max_tokens: Optional[int] = None,
+                                sampling: str = "first", backend: Optional[str] = None,
+                                dehyphenate: bool = False, remove_headers: bool = False,
+                                cancel_token: Optional[CancellationToken] = None) -> str:
+    """
+    Extract text content from PDF bytes (for uploaded files)
+    
+    Args:
+        pdf_bytes (bytes): PDF file content as bytes
+        max_pages (Optional[int]): Maximum number of pages to parse
+        max_chars (Optional[int]): Stop once this many characters are extracted
+        max_tokens (Optional[int]): Stop once roughly this many tokens are extracted
+        sampling (str): Page sampling strategy, one of SAMPLING_STRATEGIES
+        backend (Optional[str]): Extraction backend name or "auto"; defaults
+            to the PDF_EXTRACTION_BACKEND setting
+        dehyphenate (bool): Rejoin words hyphenated across line breaks
+        remove_headers (bool): Drop running headers and footers repeated across pages
+        cancel_token (Optional[CancellationToken]): Stops extraction between pages when cancelled
         
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            
-            # Check if PDF is encrypted
-            if pdf_reader.is_encrypted:
-                raise Exception("PDF is encrypted and cannot be processed")
-            
-            # Extract text from all pages
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                page_text = page.extract_text()
-                
-                if page_text:
-                    text += page_text + "\n"
+    Returns:
+        str: Extracted text content
         
-        # Clean up the text
-        text = clean_extracted_text(text)
+    Raises:
+        CancelledError: If the cancellation token was cancelled
+        Exception: If PDF cannot be read or processed
+    """
+    with open_pdf(pdf_bytes, backend) as document:
+        return extract_text_from_document(document, max_pages, max_chars, max_tokens, sampling,
+                                          dehyphenate, remove_headers, cancel_token)
+
+def open_pdf(source, backend: Optional[str] = None) -> ExtractionBackend:
+    """
+    Open a PDF with an extraction backend
+    
+    Args:
+        source: Path, bytes or binary stream of the PDF
+        backend (Optional[str]): Extraction backend name or "auto"; defaults
+            to the PDF_EXTRACTION_BACKEND setting
         
-        if not text.strip():
-            raise Exception("No readable text content found in PDF")
-            
-        return text
+    Returns:
+        ExtractionBackend: Open document; its name is the backend that was chosen
         
+    Raises:
+        Exception: If the PDF cannot be opened
+    """
+    try:
+        return open_backend(source, backend)
     except Exception as e:
         raise Exception(f"Error reading PDF: {str(e)}")
 
-def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
+def extract_text_from_document(document: ExtractionBackend, max_pages: Optional[int] = None,
+                               max_chars: Optional[int] = None, max_tokens: Optional[int] = None,
+                               sampling: str = "first", dehyphenate: bool = False,
+                               remove_headers: bool = False,
+                               cancel_token: Optional[CancellationToken] = None) -> str:
     """
-    Extract text content from PDF bytes (for uploaded files)
+    Extract text content from a PDF opened with open_pdf
     
     Args:
-        pdf_bytes (bytes): PDF file content as bytes
+        document (ExtractionBackend): Open document
+        max_pages (Optional[int]): Maximum number of pages to parse
+        max_chars (Optional[int]): Stop once this many characters are extracted
+        max_tokens (Optional[int]): Stop once roughly this many tokens are extracted
+        sampling (str): Page sampling strategy, one of SAMPLING_STRATEGIES
+        dehyphenate (bool): Rejoin words hyphenated across line breaks
+        remove_headers (bool): Drop running headers and footers repeated across pages
+        cancel_token (Optional[CancellationToken]): Stops extraction between pages when cancelled
         
     Returns:
         str: Extracted text content
         
     Raises:
+        CancelledError: If the cancellation token was cancelled
         Exception: If PDF cannot be read or processed
     """
     try:
-        text = ""
-        
-        pdf_file = io.BytesIO(pdf_bytes)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        
-        # Check if PDF is encrypted
-        if pdf_reader.is_encrypted:
-            raise Exception("PDF is encrypted and cannot be processed")
-        
-        # Extract text from all pages
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            page_text = page.extract_text()
-            
-            if page_text:
-                text += page_text + "\n"
-        
-        # Clean up the text
-        text = clean_extracted_text(text)
+        text = _extract_text_from_document(document, max_pages, max_chars, max_tokens, sampling,
+                                           dehyphenate, remove_headers, cancel_token)
         
         if not text.strip():
             raise Exception("No readable text content found in PDF")
             
         return text
         
+    except CancelledError:
+        raise
     except Exception as e:
         raise Exception(f"Error reading PDF: {str(e)}")
 
-def clean_extracted_text(text: str) -> str:
+def select_pages(num_pages: int, max_pages: Optional[int] = None, sampling: str = "first") -> List[int]:
+    """
+    Choose which pages to parse and in which order
+    
+    The visiting order puts the most representative pages first, so an
+    early exit on a character budget still covers the requested spread.
+    
+    Args:
+        num_pages (int): Number of pages in the document
+        max_pages (Optional[int]): Maximum number of pages to select
+        sampling (str): "first" for leading pages, "first_last" for pages from
+            both ends, "even" for evenly spaced pages
+        
+    Returns:
+        List[int]: Zero-based page indices in visiting order
+    """
+    if sampling not in SAMPLING_STRATEGIES:
+        raise ValueError(f"Unknown sampling strategy '{sampling}', expected one of {SAMPLING_STRATEGIES}")
+    
+    count = num_pages if max_pages is None else max(0, min(max_pages, num_pages))
+    
+    if sampling == "first":
+        return list(range(count))
+    
+    if sampling == "first_last":
+        # Alternate between the start and the end of the document
+        order = []
+        front, back = 0, num_pages - 1
+        while len(order) < count:
+            order.append(front)
+            front += 1
+            if len(order) < count:
+                order.append(back)
+                back -= 1
+        return order
+    
+    # Evenly spaced pages, visited coarse-to-fine
+    if count == 0:
+        return []
+    if count == 1:
+        candidates = [0]
+    else:
+        candidates = [round(i * (num_pages - 1) / (count - 1)) for i in range(count)]
+    order = []
+    visited = set()
+    step = 1
+    while step < count:
+        step *= 2
+    while step >= 1:
+        for i in range(0, count, step):
+            if i not in visited:
+                visited.add(i)
+                order.append(candidates[i])
+        step //= 2
+    return order
+
+def _extract_text_from_document(document: ExtractionBackend, max_pages: Optional[int], max_chars: Optional[int],
+                                max_tokens: Optional[int], sampling: str, dehyphenate: bool = False,
+                                remove_headers: bool = False,
+                                cancel_token: Optional[CancellationToken] = None) -> str:
+    """
+    Extract and clean text from an open document within a budget
+    
+    Every backend goes through the same page selection and cleaning.
+    
+    Args:
+        document (ExtractionBackend): Open document
+        max_pages (Optional[int]): Maximum number of pages to parse
+        max_chars (Optional[int]): Character budget
+        max_tokens (Optional[int]): Token budget
+        sampling (str): Page sampling strategy
+        dehyphenate (bool): Rejoin words hyphenated across line breaks
+        remove_headers (bool): Drop running headers and footers
+        cancel_token (Optional[CancellationToken]): Checked before each page
+        
+    Returns:
+        str: Cleaned text of the selected pages in document order
+    """
+    # Check if PDF is encrypted
+    if document.is_encrypted:
+        raise Exception("PDF is encrypted and cannot be processed")
+    
+    char_budget = max_chars
+    if max_tokens is not None:
+        token_chars = max_tokens * CHARS_PER_TOKEN
+        char_budget = token_chars if char_budget is None else min(char_budget, token_chars)
+    
+    page_texts = {}
+    extracted_chars = 0
+    
+    for page_num in select_pages(document.page_count, max_pages, sampling):
+        check_cancelled(cancel_token)
+        page_text = document.page_text(page_num)
+        
+        if page_text:
+            page_texts[page_num] = page_text
+            extracted_chars += len(page_text)
+        
+        # Stop parsing as soon as the budget is filled
+        if char_budget is not None and extracted_chars >= char_budget:
+            break
+    
+    pages = [page_texts[page_num] for page_num in sorted(page_texts)]
+    if remove_headers:
+        pages = remove_repeated_lines(pages)
+    
+    # Clean up the text
+    text = clean_extracted_text("\n".join(pages), dehyphenate)
+    
+    if char_budget is not None:
+        text = text[:char_budget]
+    
+    return text
+
+def clean_extracted_text(text: str, dehyphenate: bool = False) -> str:
     """
     Clean and normalize extracted text
     
     Args:
         text (str): Raw extracted text
+        dehyphenate (bool): Rejoin words hyphenated across line breaks
         
     Returns:
         str: Cleaned text
@@ -99,39 +268,69 @@ def clean_extracted_text(text: str) -> str:
     if not text:
         return ""
     
-    # Remove excessive whitespace and newlines
-    lines = text.split('\n')
-    cleaned_lines = []
+    if dehyphenate:
+        text = _HYPHENATED_BREAK_RE.sub('', text)
     
-    for line in lines:
-        line = line.strip()
-        if line:  # Skip empty lines
-            cleaned_lines.append(line)
+    # str.split() with no separator splits on runs of any whitespace and drops
+    # empty strings, so one pass strips lines, drops blank ones and collapses spaces
+    return ' '.join(text.split())
+
+def remove_repeated_lines(page_texts: List[str], edge_lines: int = HEADER_FOOTER_LINES,
+                          min_share: float = 0.5) -> List[str]:
+    """
+    Remove running headers and footers repeated across pages
     
-    # Join lines with single spaces
-    cleaned_text = ' '.join(cleaned_lines)
+    Only the first and last few non-empty lines of each page are considered.
+    Digits are ignored when comparing lines, so "Page 3 of 40" matches
+    "Page 4 of 40".
     
-    # Remove excessive spaces
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
+    Args:
+        page_texts (List[str]): Raw text of each page
+        edge_lines (int): Number of lines at the top and bottom of a page to check
+        min_share (float): Fraction of pages a line must appear on to be removed
+        
+    Returns:
+        List[str]: Page texts without repeated header and footer lines
+    """
+    if len(page_texts) < MIN_PAGES_FOR_HEADER_DETECTION:
+        return page_texts
+    
+    pages = [[line for line in page.splitlines() if line.strip()] for page in page_texts]
+    
+    def edges(lines):
+        if len(lines) <= 2 * edge_lines:
+            return list(range(len(lines)))
+        return list(range(edge_lines)) + list(range(len(lines) - edge_lines, len(lines)))
+    
+    def normalize(line):
+        return _DIGITS_RE.sub('#', line.strip())
     
-    return cleaned_text.strip()
+    counts = Counter()
+    for lines in pages:
+        counts.update({normalize(lines[i]) for i in edges(lines)})
+    
+    threshold = max(2, min_share * len(pages))
+    repeated = {line for line, count in counts.items() if count >= threshold}
+    if not repeated:
+        return page_texts
+    
+    cleaned_pages = []
+    for lines in pages:
+        drop = {i for i in edges(lines) if normalize(lines[i]) in repeated}
+        cleaned_pages.append('\n'.join(line for i, line in enumerate(lines) if i not in drop))
+    return cleaned_pages
 
 def validate_pdf_file(file_path: str) -> bool:
     """
     Validate if a file is a valid PDF
     
+    Uses the pre-flight check, so only the header, trailer and a sample of
+    content streams are read instead of building a full PdfReader.
+    
     Args:
         file_path (str): Path to the file
         
     Returns:
         bool: True if valid PDF, False otherwise
     """
-    try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            # Try to access the first page to validate
-            if len(pdf_reader.pages) > 0:
-                return True
-        return False
-    except:
-        return False
+    return preflight_pdf(file_path)['status'] != STATUS_CORRUPT
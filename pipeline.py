@@ -0,0 +1,154 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional
+from cancellation import CancellationToken
+from pdf_processor import extract_text_from_pdf, extract_text_from_document, open_pdf
+from openai_service import (summarize_text, synthesize_summaries, prepare_summary_input, synthesis_route, RunReport,
+                            SUMMARY_PROMPT_VERSION, SYNTHESIS_PROMPT_VERSION)
+from document_store import DocumentStore, synthesis_key, text_sha256
+from extraction_backends import EXTRACTION_BACKEND
+from ingestion import MAX_FILE_BYTES
+
+# Pipeline settings shared by the Streamlit app and the load test harness
+
+# Extraction budget per document; pages are sampled evenly across long PDFs
+# and parsing stops once this many characters have been extracted
+EXTRACTION_MAX_CHARS = 400000
+EXTRACTION_SAMPLING = "even"
+
+# Largest PDF accepted by the pre-flight check: the per-file upload budget
+MAX_UPLOAD_BYTES = MAX_FILE_BYTES
+
+# Worker threads for blocking pipeline steps, shared by all sessions in the process
+PIPELINE_WORKERS = 16
+
+# Seconds between checks for a stopped run while a pipeline step works in the background
+PIPELINE_POLL_INTERVAL = 0.25
+
+_pipeline_pool = ThreadPoolExecutor(max_workers=PIPELINE_WORKERS, thread_name_prefix="pipeline")
+
+# Bump when text extraction or cleaning changes, so stored text is re-extracted
+EXTRACTION_REVISION = 1
+
+# Identifies the extraction settings that produced stored document text
+EXTRACTION_VERSION = hashlib.sha256(
+    f"{EXTRACTION_REVISION}:{EXTRACTION_MAX_CHARS}:{EXTRACTION_SAMPLING}".encode("utf-8")
+).hexdigest()[:12]
+
+def run_pipeline_step(on_wait: Optional[Callable[[], None]], cancel_token: Optional[CancellationToken],
+                      fn: Callable, *args, **kwargs):
+    """
+    Run a blocking pipeline step on the shared worker pool
+
+    The calling thread waits in PIPELINE_POLL_INTERVAL slices and calls
+    on_wait after each one. In the Streamlit app on_wait updates the progress
+    bar, which is where Streamlit stops a run that was superseded or whose
+    session ended.
+
+    Args:
+        on_wait (Optional[Callable[[], None]]): Called while the step is still running
+        cancel_token (Optional[CancellationToken]): Passed to fn as cancel_token
+        fn (Callable): Pipeline step accepting a cancel_token keyword argument
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+
+    Returns:
+        The result of fn
+    """
+    future = _pipeline_pool.submit(fn, *args, cancel_token=cancel_token, **kwargs)
+    while True:
+        try:
+            return future.result(timeout=PIPELINE_POLL_INTERVAL)
+        except FutureTimeoutError:
+            if on_wait is not None:
+                on_wait()
+
+def extract_document(pdf_path: str, cancel_token: Optional[CancellationToken] = None,
+                     file_hash: Optional[str] = None, filename: str = "",
+                     store: Optional[DocumentStore] = None) -> str:
+    """
+    Extract text from an uploaded PDF with the app's extraction settings
+
+    Args:
+        pdf_path (str): Path to the PDF file
+        cancel_token (Optional[CancellationToken]): Stops extraction when cancelled
+        file_hash (Optional[str]): SHA-256 of the file; required to use the store
+        filename (str): Original filename, recorded with stored text
+        store (Optional[DocumentStore]): Reuses text already extracted with the same settings
+            and backend; the PDF is only opened when none is stored
+
+    Returns:
+        str: Cleaned document text
+    """
+    settings = dict(max_chars=EXTRACTION_MAX_CHARS, sampling=EXTRACTION_SAMPLING,
+                    dehyphenate=True, remove_headers=True, cancel_token=cancel_token)
+    if store is None or file_hash is None:
+        return extract_text_from_pdf(pdf_path, backend=EXTRACTION_BACKEND, **settings)
+
+    # Backends extract different text from the same PDF. A configured backend
+    # only reuses its own text; auto mode reuses whichever text was stored
+    # first, since its probe can pick a different backend on every run
+    backend = None if EXTRACTION_BACKEND == "auto" else EXTRACTION_BACKEND
+    stored = store.get_document(file_hash, EXTRACTION_VERSION, backend)
+    if stored is not None:
+        return stored['text']
+
+    with open_pdf(pdf_path, EXTRACTION_BACKEND) as document:
+        text = extract_text_from_document(document, **settings)
+
+    store.put_document(file_hash, EXTRACTION_VERSION, document.name, filename or pdf_path, text)
+    return text
+
+def summarize_document(text: str, filename: str, cancel_token: Optional[CancellationToken] = None,
+                       report: Optional[RunReport] = None, store: Optional[DocumentStore] = None) -> Dict:
+    """
+    Summarize one document with the app's summarization settings
+
+    Args:
+        text (str): Cleaned document text
+        filename (str): Document filename
+        cancel_token (Optional[CancellationToken]): Aborts the request when cancelled
+        report (Optional[RunReport]): Collects the routing decision, latency and cost
+        store (Optional[DocumentStore]): Reuses a summary of the same text made with the same prompt
+
+    Returns:
+        Dict: Summary dictionary with 'filename', 'summary' and 'word_count' keys
+    """
+    # The prompt version covers the routing settings, so the stored summary
+    # is found without compressing the text to pick a model
+    summary = store.get_summary(text_sha256(text), SUMMARY_PROMPT_VERSION) if store is not None else None
+    if summary is None:
+        prepared, route = prepare_summary_input(text, compress=True)
+        summary = summarize_text(prepared, filename, cancel_token=cancel_token, report=report, route=route)
+        if store is not None:
+            store.put_summary(text_sha256(text), SUMMARY_PROMPT_VERSION, route['model'], summary)
+
+    return {
+        'filename': filename,
+        'summary': summary,
+        'word_count': len(text.split())
+    }
+
+def synthesize_documents(summaries: List[Dict], cancel_token: Optional[CancellationToken] = None,
+                         report: Optional[RunReport] = None, store: Optional[DocumentStore] = None) -> str:
+    """
+    Synthesize document summaries, reusing a stored synthesis of the same set
+
+    Args:
+        summaries (List[Dict]): Summary dictionaries from summarize_document
+        cancel_token (Optional[CancellationToken]): Aborts the request when cancelled
+        report (Optional[RunReport]): Collects the routing decision, latency and cost
+        store (Optional[DocumentStore]): Reuses a synthesis of the same summaries made with the same prompt
+
+    Returns:
+        str: Comprehensive synthesis
+    """
+    if store is None or not summaries:
+        return synthesize_summaries(summaries, cancel_token=cancel_token, report=report)
+
+    key = synthesis_key(summaries)
+    synthesis = store.get_synthesis(key, SYNTHESIS_PROMPT_VERSION)
+    if synthesis is None:
+        synthesis = synthesize_summaries(summaries, cancel_token=cancel_token, report=report)
+        store.put_synthesis(key, SYNTHESIS_PROMPT_VERSION, synthesis_route(summaries)['model'], synthesis)
+    return synthesis
@@ -0,0 +1,82 @@
+import time
+
+import extraction_backends
+from extraction_backends import ExtractionBackend, open_backend
+
+class FakeBackend(ExtractionBackend):
+    """Ten-page document with a blank cover page"""
+
+    page_delay = 0.0
+    opened = []
+
+    def __init__(self, source):
+        self.closed = False
+        self.pages_read = []
+        self.opened.append(self)
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @property
+    def page_count(self) -> int:
+        return 10
+
+    @property
+    def is_encrypted(self) -> bool:
+        return False
+
+    def page_text(self, page_num: int) -> str:
+        time.sleep(self.page_delay)
+        self.pages_read.append(page_num)
+        return "" if page_num == 0 else f"Text of page {page_num}"
+
+    def close(self) -> None:
+        self.closed = True
+
+class FastBackend(FakeBackend):
+    name = "fast"
+
+class SlowBackend(FakeBackend):
+    name = "slow"
+    page_delay = 0.05
+
+def test_auto_probes_past_blank_cover_and_keeps_winner_open(monkeypatch):
+    monkeypatch.setattr(extraction_backends, "BACKENDS", {"slow": SlowBackend, "fast": FastBackend})
+    monkeypatch.setattr(extraction_backends, "DEFAULT_BACKEND", "slow")
+    monkeypatch.setattr(FakeBackend, "opened", [])
+
+    document = open_backend(b"%PDF-fake" * 100000, "auto")
+
+    assert isinstance(document, FastBackend)
+    assert not document.closed
+    assert sorted(document.pages_read) == [0, 4, 9]
+    # The slower backend stops probing once it falls behind and is closed
+    slow = [opened for opened in FakeBackend.opened if isinstance(opened, SlowBackend)]
+    assert len(slow) == 1 and slow[0].closed
+    assert slow[0].pages_read == [0]
+    assert len(FakeBackend.opened) == 2
+
+def test_small_documents_use_default_backend(monkeypatch):
+    monkeypatch.setattr(extraction_backends, "BACKENDS", {"slow": SlowBackend, "fast": FastBackend})
+    monkeypatch.setattr(extraction_backends, "DEFAULT_BACKEND", "slow")
+    assert isinstance(open_backend(b"%PDF-fake", "auto"), SlowBackend)
+
+def _encrypted_pdf(path, user_password: str) -> str:
+    from pypdf import PdfWriter
+    writer = PdfWriter()
+    writer.add_blank_page(width=200, height=200)
+    writer.encrypt(user_password, "owner", algorithm="RC4-128")
+    with open(path, "wb") as file:
+        writer.write(file)
+    return str(path)
+
+def test_backends_agree_on_encryption(tmp_path):
+    open_with_empty_password = _encrypted_pdf(tmp_path / "empty.pdf", "")
+    locked = _encrypted_pdf(tmp_path / "locked.pdf", "secret")
+    for name in extraction_backends.available_backends():
+        with open_backend(open_with_empty_password, name) as document:
+            assert document.is_encrypted is False, name
+            assert document.page_count == 1
+        with open_backend(locked, name) as document:
+            assert document.is_encrypted is True, name
@@ -0,0 +1,53 @@
+import hashlib
+import io
+
+import pytest
+
+from ingestion import IngestionSession, UploadBudgetError
+
+class FakeUploadedFile(io.BytesIO):
+    """Stand-in for Streamlit's UploadedFile"""
+
+    def __init__(self, name, data, file_id=None):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+        if file_id is not None:
+            self.file_id = file_id
+
+@pytest.fixture
+def session():
+    session = IngestionSession(max_file_bytes=1000, max_session_bytes=1500)
+    yield session
+    session.close()
+
+def test_same_name_and_size_with_different_content_are_kept_apart(session):
+    first = session.add("report.pdf", io.BytesIO(b"%PDF-aaaa"))
+    second = session.add("report.pdf", io.BytesIO(b"%PDF-bbbb"))
+    assert first.sha256 != second.sha256
+    assert len(session.uploads) == 2
+    with open(second.path, 'rb') as file:
+        assert file.read() == b"%PDF-bbbb"
+
+def test_same_upload_is_spooled_once(session):
+    first = session.add("report.pdf", io.BytesIO(b"%PDF-aaaa"))
+    assert session.add("report.pdf", io.BytesIO(b"%PDF-aaaa")) is first
+    assert session.total_bytes == len(b"%PDF-aaaa")
+
+def test_sync_uses_file_ids_and_releases_removed_files(session):
+    files = [FakeUploadedFile("a.pdf", b"%PDF-aaaa", "id-1"), FakeUploadedFile("a.pdf", b"%PDF-bbbb", "id-2")]
+    accepted, rejected = session.sync(files)
+    assert [upload.sha256 for upload in accepted] == [hashlib.sha256(b"%PDF-aaaa").hexdigest(),
+                                                      hashlib.sha256(b"%PDF-bbbb").hexdigest()]
+    assert rejected == []
+
+    accepted, _ = session.sync(files[1:])
+    assert [upload.key for upload in accepted] == [("id", "id-2")]
+    assert ("id", "id-1") not in {upload.key for upload in session.uploads}
+
+def test_budgets_reject_large_uploads(session):
+    with pytest.raises(UploadBudgetError):
+        session.add("big.pdf", io.BytesIO(b"x" * 1001))
+    session.add("one.pdf", io.BytesIO(b"x" * 1000))
+    accepted, rejected = session.sync([FakeUploadedFile("two.pdf", b"y" * 600, "id-3")])
+    assert accepted and not rejected  # one.pdf was released because it is not in the uploader
@@ -0,0 +1,176 @@
+import asyncio
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import openai_service
+from openai import AsyncOpenAI
+from cancellation import CancellationToken, CancelledError
+from load_test import MockLLMHandler, start_mock_llm
+
+REQUEST = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Summarize this."}], "max_tokens": 50}
+
+@pytest.fixture(scope="module")
+def mock_llm():
+    server = start_mock_llm(latency_median=1.0, latency_sigma=0.0)
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+@pytest.fixture
+def service(mock_llm, monkeypatch):
+    monkeypatch.setattr(openai_service, "async_client", AsyncOpenAI(api_key="test-key", base_url=mock_llm))
+    monkeypatch.setattr(openai_service, "_breaker", openai_service.CircuitBreaker())
+    return openai_service
+
+class ScriptedClient:
+    """Stand-in async client whose n-th request takes delays[n] seconds and then answers or raises"""
+
+    def __init__(self, delays, error: Exception = None):
+        self.delays = list(delays)
+        self.error = error
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **request):
+        call = self.calls
+        self.calls += 1
+        await asyncio.sleep(self.delays[min(call, len(self.delays) - 1)])
+        if self.error is not None:
+            raise self.error
+        return f"response {call}"
+
+def wait_for_idle(service, timeout: float) -> float:
+    """Seconds until no request is open against the API"""
+    started = time.monotonic()
+    while service.in_flight_requests() and time.monotonic() - started < timeout:
+        time.sleep(0.01)
+    return time.monotonic() - started
+
+def test_cancel_aborts_the_in_flight_request(service, monkeypatch):
+    monkeypatch.setattr(MockLLMHandler, "latency_median", 5.0)
+    token = CancellationToken()
+    threading.Timer(0.3, token.cancel).start()
+
+    started = time.monotonic()
+    with pytest.raises(CancelledError):
+        service._create_completion(30, cancel_token=token, **REQUEST)
+    assert time.monotonic() - started < 1.0
+
+    # The request itself is aborted, not left running until the server answers
+    wait_for_idle(service, 5.0)
+    assert time.monotonic() - started < 1.0
+    assert service.in_flight_requests() == 0
+
+def test_deadline_aborts_the_request_and_counts_as_upstream_failure(service, monkeypatch):
+    monkeypatch.setattr(MockLLMHandler, "latency_median", 3.0)
+
+    started = time.monotonic()
+    with pytest.raises(Exception, match="within 0.5 seconds"):
+        service._create_completion(0.5, **REQUEST)
+    assert wait_for_idle(service, 5.0) + time.monotonic() - started < 1.5
+    assert service._breaker._failures == 1
+
+def test_concurrent_calls_do_not_spend_their_deadline_queueing(service, monkeypatch):
+    monkeypatch.setattr(MockLLMHandler, "latency_median", 0.5)
+
+    with ThreadPoolExecutor(max_workers=48) as pool:
+        futures = [pool.submit(service._create_completion, 2.0, **REQUEST) for _ in range(48)]
+        responses = [future.result() for future in futures]
+
+    assert len(responses) == 48
+    assert service._breaker._failures == 0
+
+def test_synthesis_budget_never_drops_below_the_fixed_budget(service):
+    for document_count in (1, 2, 3, 10):
+        route = service.route_request("synthesis", 1000, document_count)
+        assert service.SYNTHESIS_MIN_TOKENS <= route['max_tokens'] <= service.SYNTHESIS_MAX_TOKENS
+    assert service.SYNTHESIS_MIN_TOKENS >= 1200
+
+def test_truncated_synthesis_is_retried_with_a_larger_budget(service, monkeypatch):
+    monkeypatch.setattr(MockLLMHandler, "latency_median", 0.05)
+    monkeypatch.setattr(MockLLMHandler, "completion_tokens", 1800)
+    report = service.RunReport()
+
+    service.synthesize_summaries([{'filename': "a.pdf", 'summary': "Revenue grew."}], report=report)
+
+    assert [call['max_tokens'] for call in report.calls] == [1200, service.SYNTHESIS_RETRY_MAX_TOKENS]
+
+def test_truncated_summary_is_retried_once_at_the_retry_budget(service, monkeypatch):
+    monkeypatch.setattr(MockLLMHandler, "latency_median", 0.05)
+    monkeypatch.setattr(MockLLMHandler, "completion_tokens", 500)
+    report = service.RunReport()
+
+    service.summarize_text("Revenue grew by four percent.", "a.pdf", report=report)
+
+    assert [call['max_tokens'] for call in report.calls] == [service.SUMMARY_MIN_TOKENS,
+                                                            service.SUMMARY_RETRY_MAX_TOKENS]
+
+def test_summary_still_cut_off_after_one_retry_fails(service, monkeypatch):
+    monkeypatch.setattr(MockLLMHandler, "latency_median", 0.05)
+    monkeypatch.setattr(MockLLMHandler, "completion_tokens", 10000)
+    report = service.RunReport()
+
+    with pytest.raises(Exception, match="cut off"):
+        service.summarize_text("Revenue grew by four percent.", "a.pdf", report=report)
+    assert len(report.calls) == 2
+
+def test_synthesis_still_cut_off_after_retry_fails(service, monkeypatch):
+    monkeypatch.setattr(MockLLMHandler, "latency_median", 0.05)
+    monkeypatch.setattr(MockLLMHandler, "completion_tokens", 10000)
+
+    with pytest.raises(Exception, match="cut off"):
+        service.synthesize_summaries([{'filename': "a.pdf", 'summary': "Revenue grew."}])
+
+def test_slow_request_is_hedged_and_the_first_response_wins(service, monkeypatch):
+    latency = defaultdict(service.LatencyTracker)
+    for _ in range(service.HEDGE_MIN_SAMPLES):
+        latency[REQUEST['model']].record(0.1)
+    monkeypatch.setattr(service, "_latency", latency)
+    client = ScriptedClient([5.0, 0.05])
+    monkeypatch.setattr(service, "async_client", client)
+
+    started = time.monotonic()
+    response = service._create_completion(10, hedge=True, **REQUEST)
+
+    # The duplicate fires at the 95th percentile (0.1s) and answers first
+    assert response == "response 1"
+    assert client.calls == 2
+    assert time.monotonic() - started < 1.0
+    # The slow original is aborted rather than left running
+    assert wait_for_idle(service, 1.0) < 1.0
+
+def test_breaker_opens_fails_fast_and_lets_one_trial_through(service, monkeypatch):
+    monkeypatch.setattr(service, "_breaker", service.CircuitBreaker(cooldown=0.2))
+    client = ScriptedClient([0.0], error=service.DeadlineExceeded("OpenAI did not respond"))
+    monkeypatch.setattr(service, "async_client", client)
+
+    for _ in range(service.BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(service.DeadlineExceeded):
+            service._create_completion(5, **REQUEST)
+
+    # Open: calls fail without reaching the API
+    with pytest.raises(Exception, match="currently unavailable"):
+        service._create_completion(5, **REQUEST)
+    assert client.calls == service.BREAKER_FAILURE_THRESHOLD
+
+    # After the cooldown one trial call goes through; when it fails the
+    # breaker stays open for another cooldown
+    time.sleep(0.25)
+    with pytest.raises(service.DeadlineExceeded):
+        service._create_completion(5, **REQUEST)
+    with pytest.raises(Exception, match="currently unavailable"):
+        service._create_completion(5, **REQUEST)
+    assert client.calls == service.BREAKER_FAILURE_THRESHOLD + 1
+
+    # A successful trial closes it again
+    time.sleep(0.25)
+    client.error = None
+    assert service._create_completion(5, **REQUEST) == f"response {client.calls - 1}"
+    assert service._create_completion(5, **REQUEST) == f"response {client.calls - 1}"
@@ -0,0 +1,103 @@
+import os
+
+import pytest
+from pypdf import PdfWriter
+from pypdf.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject, NumberObject
+
+from pdf_preflight import (preflight_pdf, triage_pdfs, SAMPLE_BYTES, MAX_SAMPLED_STREAMS,
+                           STATUS_OK, STATUS_NO_TEXT, STATUS_CORRUPT, STATUS_OVERSIZED)
+
+TEXT_STREAM = b"BT /F1 12 Tf 72 720 Td (Quarterly revenue grew) Tj ET"
+
+def _stream(writer, data, **entries):
+    stream = DecodedStreamObject()
+    stream.set_data(data)
+    for key, value in entries.items():
+        stream[NameObject(f"/{key}")] = value
+    return writer._add_object(stream)
+
+def _font():
+    return DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    })
+
+def write_pdf(path, pages):
+    """Write a PDF whose pages are given as (content streams, resources) pairs"""
+    writer = PdfWriter()
+    for streams, resources in pages:
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Contents")] = ArrayObject(_stream(writer, data) for data in streams)
+        page[NameObject("/Resources")] = resources
+    with open(path, "wb") as file:
+        writer.write(file)
+    return str(path)
+
+def test_text_pdf_is_ok(tmp_path):
+    path = write_pdf(tmp_path / "text.pdf", [([TEXT_STREAM], DictionaryObject({
+        NameObject("/Font"): DictionaryObject({NameObject("/F1"): _font()})}))] * 3)
+    assert preflight_pdf(path)["status"] == STATUS_OK
+
+def test_text_after_many_drawing_streams_is_ok(tmp_path):
+    # Each page's /Contents holds more drawing streams than the raw sample inspects
+    drawing = [f"{k} {k} 90 90 re S".encode() for k in range(MAX_SAMPLED_STREAMS + 4)]
+    resources = DictionaryObject({NameObject("/Font"): DictionaryObject({NameObject("/F1"): _font()})})
+    path = write_pdf(tmp_path / "drawings.pdf", [(drawing + [TEXT_STREAM], resources)] * 20)
+    assert preflight_pdf(path)["status"] == STATUS_OK
+
+def test_text_inside_form_xobject_is_ok(tmp_path):
+    writer = PdfWriter()
+    form = _stream(writer, TEXT_STREAM,
+                   Type=NameObject("/XObject"), Subtype=NameObject("/Form"),
+                   BBox=ArrayObject([NumberObject(0), NumberObject(0), NumberObject(612), NumberObject(792)]),
+                   Resources=DictionaryObject({NameObject("/Font"): DictionaryObject({NameObject("/F1"): _font()})}))
+    page = writer.add_blank_page(612, 792)
+    page[NameObject("/Contents")] = _stream(writer, b"q /Fm0 Do Q")
+    page[NameObject("/Resources")] = DictionaryObject({
+        NameObject("/XObject"): DictionaryObject({NameObject("/Fm0"): form})})
+    path = tmp_path / "form.pdf"
+    with open(path, "wb") as file:
+        writer.write(file)
+    assert preflight_pdf(str(path))["status"] == STATUS_OK
+
+def test_large_image_only_pdf_is_no_text(tmp_path):
+    writer = PdfWriter()
+    side = 1100
+    # Content streams sit between multi-megabyte images, outside the raw sample windows
+    for _ in range(3):
+        image = _stream(writer, os.urandom(side * side * 3),
+                        Type=NameObject("/XObject"), Subtype=NameObject("/Image"),
+                        Width=NumberObject(side), Height=NumberObject(side),
+                        ColorSpace=NameObject("/DeviceRGB"), BitsPerComponent=NumberObject(8))
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Contents")] = _stream(writer, b"q 612 0 0 792 0 0 cm /Im0 Do Q")
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/XObject"): DictionaryObject({NameObject("/Im0"): image})})
+    path = tmp_path / "scan.pdf"
+    with open(path, "wb") as file:
+        writer.write(file)
+    assert os.path.getsize(path) > 2 * SAMPLE_BYTES
+    assert preflight_pdf(str(path))["status"] == STATUS_NO_TEXT
+
+def test_drawing_only_pdf_is_no_text(tmp_path):
+    path = write_pdf(tmp_path / "vector.pdf", [([b"0 0 100 100 re f"], DictionaryObject())] * 2)
+    assert preflight_pdf(path)["status"] == STATUS_NO_TEXT
+
+@pytest.mark.parametrize("data, reason", [
+    (b"not a pdf at all", "Missing PDF header"),
+    (b"%PDF-1.7\n1 0 obj << >> endobj\n", "Missing end-of-file marker"),
+])
+def test_damaged_files_are_corrupt(data, reason):
+    result = preflight_pdf(data)
+    assert result["status"] == STATUS_CORRUPT
+    assert result["reason"] == reason
+
+def test_triage_groups_by_status(tmp_path):
+    path = write_pdf(tmp_path / "text.pdf", [([TEXT_STREAM], DictionaryObject())])
+    groups = triage_pdfs([("text", path), ("junk", b"junk"), ("big", path)], max_bytes=None)
+    assert [result["name"] for result in groups[STATUS_OK]] == ["text", "big"]
+    assert [result["name"] for result in groups[STATUS_CORRUPT]] == ["junk"]
+
+    groups = triage_pdfs([("text", path)], max_bytes=10)
+    assert [result["name"] for result in groups[STATUS_OVERSIZED]] == ["text"]
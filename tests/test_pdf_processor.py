@@ -0,0 +1,86 @@
+import pytest
+
+from extraction_backends import ExtractionBackend
+from pdf_processor import clean_extracted_text, extract_text_from_document, remove_repeated_lines, select_pages
+
+class RecordingBackend(ExtractionBackend):
+    """Document of 100-character pages that records which pages were read"""
+
+    name = "recording"
+
+    def __init__(self, page_count: int = 50):
+        self._page_count = page_count
+        self.pages_read = []
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @property
+    def page_count(self) -> int:
+        return self._page_count
+
+    @property
+    def is_encrypted(self) -> bool:
+        return False
+
+    def page_text(self, page_num: int) -> str:
+        self.pages_read.append(page_num)
+        return f"{page_num:03d}" + "x" * 97
+
+    def close(self) -> None:
+        pass
+
+def test_select_first_pages():
+    assert select_pages(10, 3, "first") == [0, 1, 2]
+    assert select_pages(2, 5, "first") == [0, 1]
+
+def test_select_first_last_alternates_ends():
+    assert select_pages(10, 4, "first_last") == [0, 9, 1, 8]
+
+def test_select_even_visits_coarse_to_fine():
+    pages = select_pages(100, 5, "even")
+    assert pages[:2] == [0, 99]
+    assert sorted(pages) == [0, 25, 50, 74, 99]
+
+def test_select_all_pages_without_limit():
+    for sampling in ("first", "first_last", "even"):
+        assert sorted(select_pages(7, None, sampling)) == list(range(7))
+
+def test_unknown_sampling_is_rejected():
+    with pytest.raises(ValueError):
+        select_pages(10, 3, "random")
+
+def test_extraction_stops_reading_once_char_budget_is_filled():
+    document = RecordingBackend()
+    text = extract_text_from_document(document, max_chars=250)
+    assert document.pages_read == [0, 1, 2]
+    assert len(text) == 250
+
+def test_token_budget_stops_reading_sampled_pages():
+    document = RecordingBackend()
+    extract_text_from_document(document, max_tokens=50, sampling="first_last")
+    # 50 tokens is about 200 characters, filled by the first two sampled pages
+    assert document.pages_read == [0, 49]
+
+def test_page_limit_without_budget_reads_only_selected_pages():
+    document = RecordingBackend()
+    extract_text_from_document(document, max_pages=4)
+    assert document.pages_read == [0, 1, 2, 3]
+
+def test_repeated_headers_and_footers_are_removed():
+    topics = ["revenue", "costs", "staffing", "energy", "outlook"]
+    pages = [f"Annual Report\nThis section covers {topic}.\nDetails on {topic} follow.\nPage {i + 1} of 5"
+             for i, topic in enumerate(topics)]
+    cleaned = remove_repeated_lines(pages)
+    for topic, page in zip(topics, cleaned):
+        assert "Annual Report" not in page
+        assert "of 5" not in page
+        assert page == f"This section covers {topic}.\nDetails on {topic} follow."
+
+def test_unique_lines_are_kept():
+    pages = [f"Title {name}\nBody {name}\nEnd {name}" for name in ("alpha", "beta", "gamma", "delta")]
+    assert remove_repeated_lines(pages) == pages
+
+def test_dehyphenation_joins_broken_words():
+    assert clean_extracted_text("infor-\nmation and well-\nKnown", dehyphenate=True) == "information and well- Known"
@@ -0,0 +1,90 @@
+import pytest
+
+import pipeline
+import extraction_backends
+from document_store import DocumentStore, text_sha256
+from extraction_backends import ExtractionBackend
+
+class TwoPageBackend(ExtractionBackend):
+    name = "one"
+    opened = 0
+
+    def __init__(self, source):
+        TwoPageBackend.opened += 1
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @property
+    def page_count(self) -> int:
+        return 2
+
+    @property
+    def is_encrypted(self) -> bool:
+        return False
+
+    def page_text(self, page_num: int) -> str:
+        return f"{self.name} text on page {page_num + 1}"
+
+    def close(self) -> None:
+        pass
+
+class OtherBackend(TwoPageBackend):
+    name = "other"
+
+@pytest.fixture
+def backends(monkeypatch):
+    monkeypatch.setattr(extraction_backends, "BACKENDS", {"one": TwoPageBackend, "other": OtherBackend})
+    monkeypatch.setattr(TwoPageBackend, "opened", 0)
+
+def extract(store):
+    return pipeline.extract_document("doc.pdf", file_hash="abc", filename="doc.pdf", store=store)
+
+def test_configured_backend_only_reuses_its_own_text(tmp_path, monkeypatch, backends):
+    store = DocumentStore(str(tmp_path / "store.sqlite3"))
+
+    monkeypatch.setattr(pipeline, "EXTRACTION_BACKEND", "one")
+    first = extract(store)
+    monkeypatch.setattr(pipeline, "EXTRACTION_BACKEND", "other")
+    second = extract(store)
+
+    assert first.startswith("one text") and second.startswith("other text")
+    assert store.get_document("abc", pipeline.EXTRACTION_VERSION, "one")['text'] == first
+    assert store.stats()['documents'] == 2
+
+    assert extract(store) == second
+    assert TwoPageBackend.opened == 2
+
+def test_auto_mode_reuses_stored_text_without_opening_the_pdf(tmp_path, monkeypatch, backends):
+    store = DocumentStore(str(tmp_path / "store.sqlite3"))
+    monkeypatch.setattr(pipeline, "EXTRACTION_BACKEND", "one")
+    first = extract(store)
+
+    monkeypatch.setattr(pipeline, "EXTRACTION_BACKEND", "auto")
+    assert extract(store) == first
+    assert TwoPageBackend.opened == 1
+
+def test_summary_input_is_prepared_once_and_not_on_reuse(tmp_path, monkeypatch):
+    store = DocumentStore(str(tmp_path / "store.sqlite3"))
+    prepared = []
+    prepare = pipeline.prepare_summary_input
+
+    def counting_prepare(text, compress=False):
+        prepared.append(text)
+        return prepare(text, compress)
+
+    def fake_summarize(text, filename, compress=False, cancel_token=None, report=None, route=None):
+        assert route is not None and not compress
+        return f"summary of {filename}"
+
+    monkeypatch.setattr(pipeline, "prepare_summary_input", counting_prepare)
+    monkeypatch.setattr(pipeline, "summarize_text", fake_summarize)
+
+    text = "The plant produced more energy this year. " * 50
+    first = pipeline.summarize_document(text, "a.pdf", store=store)
+    second = pipeline.summarize_document(text, "a.pdf", store=store)
+
+    assert first == second
+    assert len(prepared) == 1
+    assert store.get_summary(text_sha256(text), pipeline.SUMMARY_PROMPT_VERSION) == "summary of a.pdf"
@@ -0,0 +1,33 @@
+from text_compressor import compress_text, estimate_tokens, split_sentences, MAX_SENTENCE_CHARS
+
+NARRATIVE = " ".join(
+    f"Revenue in region {i} grew because customers renewed their contracts. "
+    f"Energy costs in region {i} remain the main risk for the coming year."
+    for i in range(200)
+)
+
+def test_text_within_budget_is_unchanged():
+    assert compress_text("Short text. Nothing to drop.", 100) == "Short text. Nothing to drop."
+
+def test_output_fits_budget_and_keeps_original_order():
+    compressed = compress_text(NARRATIVE, 300)
+    assert estimate_tokens(compressed) <= 300
+    sentences, _ = split_sentences(NARRATIVE)
+    positions = [NARRATIVE.index(sentence) for sentence in split_sentences(compressed)[0]]
+    assert positions == sorted(positions)
+    assert len(split_sentences(compressed)[0]) < len(sentences)
+
+def test_long_sentences_are_split():
+    table = " ".join(f"row {i} value {i * 3}" for i in range(500))
+    sentences, starts = split_sentences(table)
+    assert len(sentences) > 1
+    assert max(len(sentence) for sentence in sentences) <= MAX_SENTENCE_CHARS
+    assert list(starts) == sorted(starts)
+
+def test_unpunctuated_block_does_not_force_head_truncation():
+    table = " ".join(f"row{i} value {i * 3} total {i * 7} region north" for i in range(600))
+    text = table + " " + NARRATIVE
+    compressed = compress_text(text, 2800)
+    assert estimate_tokens(compressed) <= 2800
+    assert not text.startswith(compressed)
+    assert "in region 1" in compressed
@@ -0,0 +1,157 @@
+import re
+import numpy as np
+from typing import List, Tuple
+
+# Rough characters-per-token ratio for English text with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+# Longer sentences (often flattened tables or lists without punctuation) are
+# split at word boundaries, so no single unit can crowd out the rest of the budget
+MAX_SENTENCE_CHARS = 600
+
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s+(?=["\'(\[]?[A-Z0-9])')
+_TERM_RE = re.compile(r"[a-z][a-z0-9']+")
+
+STOPWORDS = np.array(sorted({
+    "a", "about", "after", "all", "also", "an", "and", "any", "are", "as", "at",
+    "be", "been", "but", "by", "can", "could", "did", "do", "does", "for", "from",
+    "had", "has", "have", "he", "her", "his", "how", "i", "if", "in", "into", "is",
+    "it", "its", "may", "more", "most", "no", "not", "of", "on", "one", "only", "or",
+    "other", "our", "she", "should", "so", "some", "such", "than", "that", "the",
+    "their", "them", "then", "there", "these", "they", "this", "those", "to", "up",
+    "was", "we", "were", "what", "when", "which", "who", "will", "with", "would",
+    "you", "your",
+}))
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a piece of text
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Approximate token count
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def split_sentences(text: str) -> Tuple[List[str], np.ndarray]:
+    """
+    Split cleaned text into sentences
+
+    Sentences longer than MAX_SENTENCE_CHARS are split into chunks at word boundaries.
+
+    Args:
+        text (str): Cleaned document text
+
+    Returns:
+        Tuple[List[str], np.ndarray]: Sentences and their start offsets in the text
+    """
+    boundaries = [0] + [match.end() for match in _SENTENCE_BOUNDARY_RE.finditer(text)] + [len(text)]
+
+    starts = []
+    for start, end in zip(boundaries, boundaries[1:]):
+        starts.append(start)
+        while end - start > MAX_SENTENCE_CHARS:
+            cut = text.rfind(' ', start + 1, start + MAX_SENTENCE_CHARS)
+            start = cut if cut > start else start + MAX_SENTENCE_CHARS
+            starts.append(start)
+    if not starts:
+        starts.append(0)
+
+    ends = starts[1:] + [len(text)]
+    sentences = [text[start:end].strip() for start, end in zip(starts, ends)]
+    return sentences, np.asarray(starts, dtype=np.int64)
+
+def score_sentences(text: str, starts: np.ndarray) -> np.ndarray:
+    """
+    Score sentences by TF-IDF similarity to the document centroid
+
+    All terms are extracted in a single regex pass over the text and mapped
+    back to their sentences by offset, so scoring is vectorized end to end.
+
+    Args:
+        text (str): Cleaned document text
+        starts (np.ndarray): Sentence start offsets from split_sentences
+
+    Returns:
+        np.ndarray: One salience score per sentence
+    """
+    num_sentences = len(starts)
+    scores = np.zeros(num_sentences, dtype=np.float64)
+
+    matches = list(_TERM_RE.finditer(text.lower()))
+    if not matches:
+        return scores
+
+    positions = np.fromiter((m.start() for m in matches), dtype=np.int64, count=len(matches))
+    terms = np.array([m.group() for m in matches])
+    rows = np.searchsorted(starts, positions, side="right") - 1
+
+    vocab, cols = np.unique(terms, return_inverse=True)
+    keep = ~np.isin(vocab, STOPWORDS)[cols]
+    rows, cols = rows[keep], cols[keep]
+    if rows.size == 0:
+        return scores
+
+    # Term frequency per (sentence, term) pair
+    vocab_size = len(vocab)
+    pairs, tf = np.unique(rows * vocab_size + cols, return_counts=True)
+    pair_rows = pairs // vocab_size
+    pair_cols = pairs % vocab_size
+
+    # Smoothed inverse document frequency, treating each sentence as a document
+    df = np.bincount(pair_cols, minlength=vocab_size)
+    idf = np.log((num_sentences + 1) / (df + 1)) + 1.0
+    weights = tf * idf[pair_cols]
+
+    # L2-normalize each sentence vector
+    norms = np.sqrt(np.bincount(pair_rows, weights=weights ** 2, minlength=num_sentences))
+    weights = weights / norms[pair_rows]
+
+    # Cosine similarity of each sentence to the document centroid
+    centroid = np.bincount(pair_cols, weights=weights, minlength=vocab_size)
+    centroid /= np.linalg.norm(centroid)
+    scores = np.bincount(pair_rows, weights=weights * centroid[pair_cols], minlength=num_sentences)
+
+    return scores
+
+def compress_text(text: str, token_budget: int) -> str:
+    """
+    Extract the most salient sentences of a document up to a token budget
+
+    Selected sentences are returned in their original order.
+
+    Args:
+        text (str): Cleaned document text
+        token_budget (int): Maximum number of tokens to keep
+
+    Returns:
+        str: Compressed text
+    """
+    if not text or estimate_tokens(text) <= token_budget:
+        return text
+
+    sentences, starts = split_sentences(text)
+    if len(sentences) < 2:
+        return text[:token_budget * CHARS_PER_TOKEN]
+
+    scores = score_sentences(text, starts)
+    lengths = np.fromiter((estimate_tokens(s) + 1 for s in sentences), dtype=np.int64, count=len(sentences))
+
+    # Greedily take the highest-scoring sentences, skipping any that no longer fit
+    order = np.argsort(-scores, kind="stable")
+    shortest = int(lengths.min())
+    remaining = token_budget
+    selected = []
+    for i in order.tolist():
+        if lengths[i] <= remaining:
+            selected.append(i)
+            remaining -= int(lengths[i])
+            if remaining < shortest:
+                break
+
+    if not selected:
+        return text[:token_budget * CHARS_PER_TOKEN]
+
+    return ' '.join(sentences[i] for i in sorted(selected))